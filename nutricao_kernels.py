@@ -0,0 +1,199 @@
+"""Kernels numéricos das fórmulas de gasto energético.
+
+As funções recebem apenas tipos primitivos (sexo codificado como inteiro:
+0 = masculino, 1 = feminino) para que possam ser compiladas pelo Numba.
+Idades fora da faixa suportada retornam NaN; cabe ao chamador convertê-lo.
+Sem o Numba instalado, as mesmas funções rodam como Python puro.
+"""
+import numpy as np
+
+try:
+    from numba import njit, vectorize
+except ImportError:  # Numba é opcional: mantém a mesma API em Python puro
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+    def vectorize(*args, **kwargs):
+        return lambda func: np.vectorize(func, otypes=[np.float64])
+
+MASCULINO = 0
+FEMININO = 1
+
+# --- TABELAS DE COEFICIENTES ---
+# Limites superiores (inclusivos) das faixas etárias, em anos: 0-3, 4-10, 11-18.
+# A faixa é obtida com np.searchsorted; índice == len(FAIXAS_IDADE) indica
+# idade fora da faixa suportada.
+FAIXAS_IDADE = np.array([3.0, 10.0, 18.0])
+
+# [sexo, faixa] -> (coeficiente do peso, constante)
+TMB_COEFS = np.array([
+    [[60.9, -54.0], [22.7, 495.0], [17.5, 651.0]],   # masculino
+    [[61.0, -51.0], [22.5, 499.0], [12.2, 746.0]],   # feminino
+])
+SCHOFIELD_COEFS = np.array([
+    [[54.48, -30.33], [22.7, 505.0], [13.4, 693.0]],
+    [[58.29, -31.05], [20.3, 486.0], [17.7, 659.0]],
+])
+
+# [sexo, faixa] -> (coeficiente do peso, coeficiente da altura, constante)
+NECESSIDADE_PC_COEFS = np.array([
+    [[0.167, 1517.4, -617.6], [19.6, 130.3, 414.9], [16.25, 137.2, 515.5]],
+    [[16.25, 1023.2, -413.5], [16.97, 161.8, 371.2], [8.365, 465.0, 200.0]],
+])
+
+# Necessidade energética em PC (qualquer idade):
+# [sexo] -> (constante, coef. do peso, coef. da altura, coef. da idade)
+NECESSIDADE_PC_GERAL_COEFS = np.array([
+    [66.5, 13.75, 5.003, -6.775],
+    [65.1, 9.56, 1.85, -4.676],
+])
+
+# Requerimento energético, lactentes (até ~3 anos): 89 x peso - 100 + adicional
+REQ_FAIXAS_LACTENTE = np.array([0.25, 0.5, 1.0, 2.92])
+REQ_ADICIONAL_LACTENTE = np.array([175.0, 56.0, 22.0, 20.0])
+
+# Requerimento energético, 3-18 anos:
+# [sexo] -> (constante, coef. da idade, coef. do peso, coef. da estatura)
+REQ_COEFS_CRIANCA = np.array([
+    [88.5, -61.9, 26.7, 903.0],
+    [135.3, -30.8, 10.0, 934.0],
+])
+REQ_FAIXAS_CRIANCA = np.array([9.0])        # 3-8 anos | 9-18 anos
+REQ_ADICIONAL_CRIANCA = np.array([20.0, 25.0])
+
+
+# --- KERNELS ESCALARES ---
+@njit(cache=True)
+def _tmb(peso, idade, sexo_int):
+    """Taxa metabólica basal (0-18 anos)"""
+    faixa = np.searchsorted(FAIXAS_IDADE, idade)
+    if faixa >= FAIXAS_IDADE.size:
+        return np.nan
+    coefs = TMB_COEFS[sexo_int, faixa]
+    return coefs[0] * peso + coefs[1]
+
+
+@njit(cache=True)
+def _tmb_schofield(peso, idade, sexo_int):
+    """Equação de Schofield (0-18 anos)"""
+    faixa = np.searchsorted(FAIXAS_IDADE, idade)
+    if faixa >= FAIXAS_IDADE.size:
+        return np.nan
+    coefs = SCHOFIELD_COEFS[sexo_int, faixa]
+    return coefs[0] * peso + coefs[1]
+
+
+@njit(cache=True)
+def _necessidade_pc(peso, altura, idade, sexo_int):
+    """Necessidade energética basal para paralisia cerebral (0-18 anos)"""
+    faixa = np.searchsorted(FAIXAS_IDADE, idade)
+    if faixa >= FAIXAS_IDADE.size:
+        return np.nan
+    coefs = NECESSIDADE_PC_COEFS[sexo_int, faixa]
+    return coefs[0] * peso + coefs[1] * altura + coefs[2]
+
+
+@njit(cache=True)
+def _necessidade_pc_geral(peso, altura, idade, sexo_int):
+    """Necessidades energéticas em crianças com PC"""
+    coefs = NECESSIDADE_PC_GERAL_COEFS[sexo_int]
+    return coefs[0] + coefs[1] * peso + coefs[2] * altura + coefs[3] * idade
+
+
+@njit(cache=True)
+def _geb_critica(idade_meses, peso, temp_c):
+    """Gasto Energético Basal para crianças criticamente enfermas"""
+    return ((17 * idade_meses) + (48 * peso) + (292 * temp_c) - 9677) * 0.239
+
+
+@njit(cache=True)
+def _req_energetico(idade, peso, estatura, sexo_int, fa):
+    """Requerimento energético para crianças e adolescentes (0-18 anos)"""
+    if idade <= REQ_FAIXAS_LACTENTE[-1]:
+        faixa = np.searchsorted(REQ_FAIXAS_LACTENTE, idade)
+        return 89 * peso - 100 + REQ_ADICIONAL_LACTENTE[faixa]
+    if idade < 3 or idade > 18:
+        return np.nan
+    coefs = REQ_COEFS_CRIANCA[sexo_int]
+    adicional = REQ_ADICIONAL_CRIANCA[np.searchsorted(REQ_FAIXAS_CRIANCA, idade, side='right')]
+    return coefs[0] + coefs[1] * idade + fa * (coefs[2] * peso + coefs[3] * estatura) + adicional
+
+
+# --- PONTOS DE ENTRADA EM LOTE ---
+# Ufuncs dinâmicas: sem assinatura explícita, cada combinação de tipos é compilada
+# na primeira chamada (e guardada em cache), não na importação do módulo.
+# As funções *_lote públicas validam as entradas antes de chamá-las (como as
+# versões *_vec de teste.py): os kernels indexam as tabelas pelo código de sexo
+# e não conferem limites.
+def _validar_sexo(sexo_int):
+    sexo_int = np.asarray(sexo_int)
+    if not np.all(np.isin(sexo_int, (MASCULINO, FEMININO))):
+        raise ValueError("Código de sexo deve ser 0 (masculino) ou 1 (feminino)")
+    return sexo_int
+
+
+@vectorize(cache=True)
+def _tmb_ufunc(peso, idade, sexo_int):
+    return _tmb(peso, idade, sexo_int)
+
+
+@vectorize(cache=True)
+def _tmb_schofield_ufunc(peso, idade, sexo_int):
+    return _tmb_schofield(peso, idade, sexo_int)
+
+
+@vectorize(cache=True)
+def _req_energetico_ufunc(idade, peso, estatura, sexo_int, fa):
+    return _req_energetico(idade, peso, estatura, sexo_int, fa)
+
+
+def tmb_lote(peso, idade, sexo_int):
+    """TMB para arrays de pacientes (NaN onde a idade passa de 18 anos)"""
+    peso = np.asarray(peso, dtype=np.float64)
+    idade = np.asarray(idade, dtype=np.float64)
+    if np.any(peso <= 0) or np.any(idade < 0):
+        raise ValueError("Peso e idade devem ser positivos")
+    return _tmb_ufunc(peso, idade, _validar_sexo(sexo_int))
+
+
+def tmb_schofield_lote(peso, idade, sexo_int):
+    """TMB de Schofield para arrays de pacientes (NaN onde a idade passa de 18 anos)"""
+    peso = np.asarray(peso, dtype=np.float64)
+    idade = np.asarray(idade, dtype=np.float64)
+    if np.any(peso <= 0) or np.any(idade < 0):
+        raise ValueError("Peso e idade devem ser positivos")
+    return _tmb_schofield_ufunc(peso, idade, _validar_sexo(sexo_int))
+
+
+def req_energetico_lote(idade, peso, estatura, sexo_int, fa):
+    """Requerimento energético para arrays de pacientes (NaN fora de 0-18 anos)"""
+    idade = np.asarray(idade, dtype=np.float64)
+    peso = np.asarray(peso, dtype=np.float64)
+    estatura = np.asarray(estatura, dtype=np.float64)
+    fa = np.asarray(fa, dtype=np.float64)
+    if np.any(idade < 0) or np.any(peso <= 0) or np.any(estatura <= 0) or np.any(fa <= 0):
+        raise ValueError("Valores devem ser positivos")
+    return _req_energetico_ufunc(idade, peso, estatura, _validar_sexo(sexo_int), fa)
+
+
+@vectorize(cache=True)
+def _necessidade_pc_geral_ufunc(peso, altura, idade, sexo_int):
+    return _necessidade_pc_geral(peso, altura, idade, sexo_int)
+
+
+def necessidade_pc_geral_lote(peso, altura, idade, sexo_int):
+    """Necessidade energética em PC para arrays de pacientes"""
+    peso = np.asarray(peso, dtype=np.float64)
+    altura = np.asarray(altura, dtype=np.float64)
+    idade = np.asarray(idade, dtype=np.float64)
+    if np.any(peso <= 0) or np.any(altura <= 0) or np.any(idade < 0):
+        raise ValueError("Valores devem ser positivos")
+    return _necessidade_pc_geral_ufunc(peso, altura, idade, _validar_sexo(sexo_int))
+
+
+@vectorize(cache=True)
+def geb_critica_lote(idade_meses, peso, temp_c):
+    """GEB de crianças criticamente enfermas para arrays de pacientes"""
+    return _geb_critica(idade_meses, peso, temp_c)
@@ -1,31 +1,97 @@
+from __future__ import annotations
+
 import streamlit as st
-import pandas as pd
-import plotly.express as px
+import numpy as np
+import functools
+import itertools
+from collections import deque
+from dataclasses import dataclass, field
 from datetime import datetime
-from enum import Enum
-from typing import *
+from enum import Enum, IntEnum
+from typing import TYPE_CHECKING, Any, Callable, Final, Sequence
 import json
+import math
+import time
+
+from nutricao_kernels import (_geb_critica, _necessidade_pc, _necessidade_pc_geral, _req_energetico,
+                              _tmb, _tmb_schofield)
+
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
 
 # --- CONSTANTES E ENUMS ---
-class Sexo(Enum):
-    MASCULINO = "Masculino"
-    FEMININO = "Feminino"
+# Percentual do peso corporal correspondente a cada membro amputado
+PROPORCOES_AMPUTACAO: Final[dict[str, float]] = {
+    "Braço": 2.7,
+    "Antebraço": 1.6,
+    "Mão": 0.7,
+    "Coxa": 10.1,
+    "Perna": 4.4,
+    "Pé": 1.5
+}
+
+# Condições motoras (PC estável) -> kcal por cm de altura
+KCAL_POR_CM_CONDICAO_MOTORA: Final[dict[str, float]] = {
+    "sem disfunção motora": 15,
+    "não apresentar disfunção mas deambular": 14,
+    "não deambular (caminhar)": 11,
+}
+CONDICOES_MOTORAS: Final[tuple[str, ...]] = tuple(KCAL_POR_CM_CONDICAO_MOTORA)
+_KCAL_POR_CM_PC = np.fromiter(KCAL_POR_CM_CONDICAO_MOTORA.values(), float)
+
+# Sexo, Raca e Condicao são IntEnum: a comparação é entre inteiros e o valor
+# de Sexo é o mesmo código usado pelos kernels (0 = masculino, 1 = feminino).
+class Sexo(IntEnum):
+    MASCULINO = 0
+    FEMININO = 1
 
-class Raca(Enum):
-    BRANCA = "Branca"
-    NEGRA = "Negra"
+class Raca(IntEnum):
+    BRANCA = 0
+    NEGRA = 1
 
-class Condicao(Enum):
-    OBESIDADE = "obesidade"
-    DESNUTRICAO = "desnutricao"
+class Condicao(IntEnum):
+    OBESIDADE = 0
+    DESNUTRICAO = 1
 
 class NivelAtividade(Enum):
     LEVE_MODERADA = "leve a moderada"
     RESTRITA_INTENSA = "restrita intensa"
     RESTRICAO_GRAVE = "restrição física grave"
 
+# Opções dos selectbox, calculadas uma vez em vez de a cada rerun
+SEXO_OPTIONS: Final = tuple(Sexo)
+RACA_OPTIONS: Final = tuple(Raca)
+CONDICAO_OPTIONS: Final = tuple(Condicao)
+NIVEL_OPTIONS: Final = tuple(n.value for n in NivelAtividade)
+
+# Harris-Benedict (adulto): sexo -> (constante, coef. peso, coef. altura, altura de referência, coef. idade)
+HB_COEFS: Final[dict[Sexo, tuple[float, float, float, float, float]]] = {
+    Sexo.MASCULINO: (88.362, 13.397, 4.799, 170, 5.677),
+    Sexo.FEMININO: (447.593, 9.247, 3.098, 160, 4.330),
+}
+
+# Fórmula exibida para a necessidade energética em PC, por sexo
+FORMULA_PC_BY_SEX: Final[dict[Sexo, str]] = {
+    Sexo.MASCULINO: "66.5 + (13.75 × Peso) + (5.003 × Altura) - (6.775 × Idade)",
+    Sexo.FEMININO: "65.1 + (9.56 × Peso) + (1.85 × Altura) - (4.676 × Idade)",
+}
+
+# Síndrome de Down: kcal por cm de altura, por sexo
+SD_COEF_BY_SEX: Final[dict[Sexo, float]] = {Sexo.MASCULINO: 16.1, Sexo.FEMININO: 14.3}
+
+# Constantes pré-calculadas das fórmulas de área do braço (AGB/AMB)
+_INV_PI_APPROX_SQ = (1.0 / 3.14) ** 2
+_INV_1256 = 1.0 / 12.56
+# Semanas por mês, usado na correção de idade de prematuros
+_INV_WEEKS_PER_MONTH = 1.0 / 4.34524
+
 # --- FUNÇÕES NUTRICIONAIS ---
-def calcular_peso_ajustado(peso_atual: float, peso_ideal: float, condicao: Condicao) -> Optional[float]:
+# As fórmulas escalares puras são memoizadas com lru_cache: o Streamlit
+# reexecuta o script a cada interação e repete as mesmas chamadas. Entradas em
+# passos de 0.1 dentro de faixas limitadas mantêm a cardinalidade baixa.
+# estimar_estatura_paralisia_cerebral fica de fora por retornar um dict mutável.
+@functools.lru_cache(maxsize=4096)
+def calcular_peso_ajustado(peso_atual: float, peso_ideal: float, condicao: Condicao) -> float | None:
     """Calcula o peso ajustado para obesidade ou desnutrição"""
     if peso_atual <= 0 or peso_ideal <= 0:
         raise ValueError("Pesos devem ser valores positivos")
@@ -36,13 +102,15 @@ def calcular_peso_ajustado(peso_atual: float, peso_ideal: float, condicao: Condi
         return (peso_atual - peso_ideal) * 0.25 + peso_atual
     return None
 
-def calcular_perda_peso(peso_usual: float, peso_atual: float) -> Optional[float]:
+@functools.lru_cache(maxsize=4096)
+def calcular_perda_peso(peso_usual: float, peso_atual: float) -> float | None:
     """Calcula a porcentagem de perda de peso"""
     if peso_usual <= 0:
         raise ValueError("Peso usual deve ser maior que zero")
     return ((peso_usual - peso_atual) / peso_usual) * 100
 
-def estimar_peso_crianca(altura_joelho: float, perimetro_braco: float, sexo: Sexo, raca: Raca) -> Optional[float]:
+@functools.lru_cache(maxsize=4096)
+def estimar_peso_crianca(altura_joelho: float, perimetro_braco: float, sexo: Sexo, raca: Raca) -> float | None:
     """Estimativa de peso para crianças e adolescentes (6-18 anos)"""
     if altura_joelho <= 0 or perimetro_braco <= 0:
         raise ValueError("Medidas devem ser positivas")
@@ -59,24 +127,28 @@ def estimar_peso_crianca(altura_joelho: float, perimetro_braco: float, sexo: Sex
             return altura_joelho * 0.71 + perimetro_braco * 2.59 - 50.43
     return None
 
+@functools.lru_cache(maxsize=4096)
 def estimar_estatura_tibia(comprimento_tibia: float) -> float:
     """Estimativa da estatura pela medida da tíbia"""
     if comprimento_tibia <= 0:
         raise ValueError("Comprimento da tíbia deve ser positivo")
     return 3.26 * comprimento_tibia + 30.8
 
+@functools.lru_cache(maxsize=4096)
 def estimar_estatura_ulna(comprimento_ulna: float) -> float:
     """Estimativa da estatura pela medida da ulna"""
     if comprimento_ulna <= 0:
         raise ValueError("Comprimento da ulna deve ser positivo")
     return 5.45 * comprimento_ulna + 20.7
 
+@functools.lru_cache(maxsize=4096)
 def calcular_idade_corrigida(idade_cronologica_meses: float, idade_gestacional_semanas: float) -> float:
     """Correção de idade para prematuros"""
     if idade_gestacional_semanas < 20 or idade_gestacional_semanas > 42:
         raise ValueError("Idade gestacional deve estar entre 20-42 semanas")
-    return idade_cronologica_meses - (40 - idade_gestacional_semanas) / 4.34524
+    return idade_cronologica_meses - (40.0 - idade_gestacional_semanas) * _INV_WEEKS_PER_MONTH
 
+@functools.lru_cache(maxsize=4096)
 def calcular_percentual_gordura(soma_dobras: float, sexo: Sexo, estagio_tanner: int, raca: Raca) -> float:
     """Estimativa do percentual de gordura corporal"""
     if soma_dobras <= 0:
@@ -109,27 +181,31 @@ def calcular_percentual_gordura(soma_dobras: float, sexo: Sexo, estagio_tanner:
         else:
             return 1.33 * soma_dobras - 0.013 * soma_dobras**2 - 2.5
 
+@functools.lru_cache(maxsize=4096)
 def calcular_circ_muscular_braco(perimetro_braco: float, dobra_tricipital: float) -> float:
     """Calcula a circunferência muscular do braço (CMB)"""
     if perimetro_braco <= 0 or dobra_tricipital <= 0:
         raise ValueError("Medidas devem ser positivas")
-    return perimetro_braco - (0.314 * (dobra_tricipital / 10))
+    return perimetro_braco - 0.314 * (dobra_tricipital * 0.1)
 
+@functools.lru_cache(maxsize=4096)
 def calcular_area_gorda_braco(circunferencia_braco: float, area_muscular_braco: float) -> float:
     """Calcula a área gorda do braço (AGB)"""
     if circunferencia_braco <= 0 or area_muscular_braco <= 0:
         raise ValueError("Medidas devem ser positivas")
-    return 0.79 * ((circunferencia_braco / 3.14) ** 2) - area_muscular_braco
+    return 0.79 * _INV_PI_APPROX_SQ * circunferencia_braco * circunferencia_braco - area_muscular_braco
 
+@functools.lru_cache(maxsize=4096)
 def calcular_area_muscular_braco(circunferencia_braco: float, dobra_tricipital: float) -> float:
     """Calcula a área muscular do braço (AMB)"""
     if circunferencia_braco <= 0 or dobra_tricipital <= 0:
         raise ValueError("Medidas devem ser positivas")
-    dobra_cm = dobra_tricipital / 10
-    return ((circunferencia_braco - 0.314 * dobra_cm) ** 2) / 12.56
+    # 0.314 * (dobra em mm / 10) == 0.0314 * dobra em mm
+    d = circunferencia_braco - 0.0314 * dobra_tricipital
+    return d * d * _INV_1256
 
 def estimar_estatura_paralisia_cerebral(comprimento_superior: float, comprimento_tibial: float, 
-                                       comprimento_joelho: float) -> Dict[str, float]:
+                                       comprimento_joelho: float) -> dict[str, float]:
     """Estimativa de estatura para crianças com paralisia cerebral (2-12 anos)"""
     medidas = {
         'Estimada_CT': 3.26 * comprimento_tibial + 30.8 + 1.4,
@@ -138,11 +214,13 @@ def estimar_estatura_paralisia_cerebral(comprimento_superior: float, comprimento
     }
     return medidas
 
+@functools.lru_cache(maxsize=4096)
 def estimar_estatura_paralisia_adolescente(idade: float, sexo: Sexo, comprimento_ulna: float) -> float:
     """Estimativa de estatura para adolescentes com paralisia cerebral"""
     sexo_bin = 1 if sexo == Sexo.MASCULINO else 0
     return 30.35 + (1.29 * idade) + (0.77 * sexo_bin) + (4.32 * comprimento_ulna)
 
+@functools.lru_cache(maxsize=4096)
 def calcular_peso_corrigido_amputacao(peso_atual: float, percentual_amputacao: float) -> float:
     """Calcula o peso corrigido para amputações"""
     if peso_atual <= 0:
@@ -151,90 +229,49 @@ def calcular_peso_corrigido_amputacao(peso_atual: float, percentual_amputacao: f
         raise ValueError("Percentual de amputação deve estar entre 0-100%")
     return peso_atual * 100 / (100 - percentual_amputacao)
 
-def calcular_gasto_energetico_total(ere: float, fator_atividade: Optional[float] = None, 
-                                  fator_estresse: Optional[float] = None) -> float:
+@functools.lru_cache(maxsize=4096)
+def calcular_gasto_energetico_total(ere: float, fator_atividade: float | None = None, 
+                                  fator_estresse: float | None = None) -> float:
     """Calcula o gasto energético total (GET)"""
     if ere <= 0:
         raise ValueError("ERE deve ser positivo")
     
-    if fator_atividade and fator_estresse:
+    if fator_atividade is not None and fator_estresse is not None:
         raise ValueError("Use apenas fator de atividade OU fator de estresse")
     
-    if fator_atividade:
-        return ere * fator_atividade
-    elif fator_estresse:
-        return ere * fator_estresse
-    return ere
+    return ere * (fator_atividade if fator_atividade is not None
+                  else fator_estresse if fator_estresse is not None else 1.0)
 
+@functools.lru_cache(maxsize=4096)
 def calcular_requerimento_energetico(idade: float, peso: float, estatura: float, 
-                                    sexo: Sexo, fator_atividade: float) -> Optional[float]:
+                                    sexo: Sexo, fator_atividade: float) -> float | None:
     """Calcula o requerimento energético para crianças e adolescentes"""
     if idade < 0 or peso <= 0 or estatura <= 0 or fator_atividade <= 0:
         raise ValueError("Valores devem ser positivos")
     
-    if idade <= 0.25:  # 0-3 meses
-        return 89 * peso - 100 + 175
-    elif idade <= 0.5:  # 4-6 meses
-        return 89 * peso - 100 + 56
-    elif idade <= 1:    # 7-12 meses
-        return 89 * peso - 100 + 22
-    elif idade <= 2.92: # 13-35 meses (~3 anos)
-        return 89 * peso - 100 + 20
-    elif 3 <= idade < 9:
-        if sexo == Sexo.MASCULINO:
-            return 88.5 - 61.9 * idade + fator_atividade * (26.7 * peso + 903 * estatura) + 20
-        else:
-            return 135.3 - 30.8 * idade + fator_atividade * (10 * peso + 934 * estatura) + 20
-    elif 9 <= idade <= 18:
-        if sexo == Sexo.MASCULINO:
-            return 88.5 - 61.9 * idade + fator_atividade * (26.7 * peso + 903 * estatura) + 25
-        else:
-            return 135.3 - 30.8 * idade + fator_atividade * (10 * peso + 934 * estatura) + 25
-    return None
+    resultado = _req_energetico(idade, peso, estatura, int(sexo), fator_atividade)
+    return None if math.isnan(resultado) else resultado
 
-def calcular_tmb(peso: float, idade: float, sexo: Sexo) -> Optional[float]:
+@functools.lru_cache(maxsize=4096)
+def calcular_tmb(peso: float, idade: float, sexo: Sexo) -> float | None:
     """Calcula a taxa metabólica basal (TMB)"""
     if peso <= 0 or idade < 0:
         raise ValueError("Peso e idade devem ser positivos")
     
-    if sexo == Sexo.MASCULINO:
-        if idade <= 3:
-            return 60.9 * peso - 54
-        elif idade <= 10:
-            return 22.7 * peso + 495
-        elif idade <= 18:
-            return 17.5 * peso + 651
-    else:
-        if idade <= 3:
-            return 61 * peso - 51
-        elif idade <= 10:
-            return 22.5 * peso + 499
-        elif idade <= 18:
-            return 12.2 * peso + 746
-    return None
+    resultado = _tmb(peso, idade, int(sexo))
+    return None if math.isnan(resultado) else resultado
 
+@functools.lru_cache(maxsize=4096)
 def calcular_necessidade_pc(peso: float, altura: float, sexo: Sexo, 
-                           idade: float, fator_estresse: float) -> Optional[float]:
+                           idade: float, fator_estresse: float) -> float | None:
     """Calcula necessidades nutricionais para paralisia cerebral"""
     if peso <= 0 or altura <= 0 or idade < 0 or fator_estresse <= 0:
         raise ValueError("Valores devem ser positivos")
     
-    if sexo == Sexo.FEMININO:
-        if idade <= 3:
-            base = 16.25 * peso + 1023.2 * altura - 413.5
-        elif idade <= 10:
-            base = 16.97 * peso + 161.8 * altura + 371.2
-        elif idade <= 18:
-            base = 8.365 * peso + 465 * altura + 200
-    else:
-        if idade <= 3:
-            base = 0.167 * peso + 1517.4 * altura - 617.6
-        elif idade <= 10:
-            base = 19.6 * peso + 130.3 * altura + 414.9
-        elif idade <= 18:
-            base = 16.25 * peso + 137.2 * altura + 515.5
-    return base * fator_estresse
+    base = _necessidade_pc(peso, altura, idade, int(sexo))
+    return None if math.isnan(base) else base * fator_estresse
 
+@functools.lru_cache(maxsize=4096)
 def necessidade_energetica_pc_5_11(altura: float, nivel_atividade: str) -> float:
     """Necessidade energética para crianças com PC (5-11 anos)"""
     if nivel_atividade == NivelAtividade.LEVE_MODERADA.value:
@@ -245,53 +282,925 @@ def necessidade_energetica_pc_5_11(altura: float, nivel_atividade: str) -> float
         return 11.1 * altura
     return 0
 
+@functools.lru_cache(maxsize=4096)
 def necessidade_energetica_pc_estaveis(altura: float, condicao_motora: str) -> float:
     """Necessidade energética para crianças/adolescentes com PC estáveis"""
-    if condicao_motora == "sem disfunção motora":
-        return 15 * altura
-    elif condicao_motora == "não deambular (caminhar)":
-        return 11 * altura
-    elif condicao_motora == "não apresentar disfunção mas deambular":
-        return 14 * altura
-    return 0
+    kcal_por_cm = KCAL_POR_CM_CONDICAO_MOTORA.get(condicao_motora)
+    if kcal_por_cm is None:
+        return 0
+    return kcal_por_cm * altura
 
+@functools.lru_cache(maxsize=4096)
 def necessidade_energetica_pc(peso: float, altura: float, idade: float, sexo: Sexo) -> float:
     """Necessidades energéticas em crianças com PC"""
-    if sexo == Sexo.MASCULINO:
-        return 66.5 + (13.75 * peso) + (5.003 * altura) - (6.775 * idade)
-    else:
-        return 65.1 + (9.56 * peso) + (1.85 * altura) - (4.676 * idade)
+    return _necessidade_pc_geral(peso, altura, idade, int(sexo))
 
+@functools.lru_cache(maxsize=4096)
 def necessidade_sindrome_down(altura: float, sexo: Sexo) -> float:
     """Necessidade energética para crianças com Síndrome de Down"""
-    if sexo == Sexo.MASCULINO:
-        return 16.1 * altura
-    else:
-        return 14.3 * altura
+    return SD_COEF_BY_SEX[sexo] * altura
 
+@functools.lru_cache(maxsize=4096)
 def geb_critica(idade_meses: float, peso: float, temp_c: float) -> float:
     """Gasto Energético Basal para crianças criticamente enfermas"""
-    return ((17 * idade_meses) + (48 * peso) + (292 * temp_c) - 9677) * 0.239
+    return _geb_critica(idade_meses, peso, temp_c)
 
-def tmb_schofield(peso: float, estatura: float, idade: float, sexo: Sexo) -> Optional[float]:
+@functools.lru_cache(maxsize=4096)
+def tmb_schofield(peso: float, estatura: float, idade: float, sexo: Sexo) -> float | None:
     """Equação de Schofield para crianças gravemente doentes"""
-    if sexo == Sexo.MASCULINO:
-        if idade <= 3:
-            return 54.48 * peso - 30.33
-        elif idade <= 10:
-            return 22.7 * peso + 505
-        elif idade <= 18:
-            return 13.4 * peso + 693
-    else:
-        if idade <= 3:
-            return 58.29 * peso - 31.05
-        elif idade <= 10:
-            return 20.3 * peso + 486
-        elif idade <= 18:
-            return 17.7 * peso + 659
-    return None
+    resultado = _tmb_schofield(peso, idade, int(sexo))
+    return None if math.isnan(resultado) else resultado
+
+# --- VERSÕES VETORIZADAS (LOTES DE PACIENTES) ---
+# As funções abaixo recebem arrays 1-D (um elemento por paciente) e substituem
+# a cadeia de if/elif por máscaras booleanas. Máscaras de sexo/raça devem ser
+# calculadas uma única vez por lote, ex.: sexo_mask = sexos == Sexo.MASCULINO.
+def calcular_peso_ajustado_vec(peso_atual: np.ndarray, peso_ideal: np.ndarray,
+                               obesidade_mask: np.ndarray) -> np.ndarray:
+    """Versão vetorizada de calcular_peso_ajustado (máscara True = obesidade)"""
+    peso_atual = np.asarray(peso_atual, dtype=np.float64)
+    peso_ideal = np.asarray(peso_ideal, dtype=np.float64)
+    if np.any(peso_atual <= 0) or np.any(peso_ideal <= 0):
+        raise ValueError("Pesos devem ser valores positivos")
+    base = np.where(obesidade_mask, peso_ideal, peso_atual)
+    return (peso_atual - peso_ideal) * 0.25 + base
+
+def calcular_perda_peso_vec(peso_usual: np.ndarray, peso_atual: np.ndarray) -> np.ndarray:
+    """Versão vetorizada de calcular_perda_peso"""
+    peso_usual = np.asarray(peso_usual, dtype=np.float64)
+    peso_atual = np.asarray(peso_atual, dtype=np.float64)
+    if np.any(peso_usual <= 0):
+        raise ValueError("Peso usual deve ser maior que zero")
+    return (peso_usual - peso_atual) / peso_usual * 100
+
+def estimar_peso_crianca_vec(altura_joelho: np.ndarray, perimetro_braco: np.ndarray,
+                             sexo_mask: np.ndarray, raca_mask: np.ndarray) -> np.ndarray:
+    """Versão vetorizada de estimar_peso_crianca (sexo_mask True = masculino, raca_mask True = branca)"""
+    altura_joelho = np.asarray(altura_joelho, dtype=np.float64)
+    perimetro_braco = np.asarray(perimetro_braco, dtype=np.float64)
+    if np.any(altura_joelho <= 0) or np.any(perimetro_braco <= 0):
+        raise ValueError("Medidas devem ser positivas")
+    sexo_mask = np.asarray(sexo_mask, dtype=bool)
+    raca_mask = np.asarray(raca_mask, dtype=bool)
+    a = np.where(sexo_mask, np.where(raca_mask, 0.68, 0.59), np.where(raca_mask, 0.77, 0.71))
+    b = np.where(sexo_mask, np.where(raca_mask, 2.64, 2.73), np.where(raca_mask, 2.47, 2.59))
+    c = np.where(sexo_mask, np.where(raca_mask, -50.08, -48.32), np.where(raca_mask, -50.16, -50.43))
+    return altura_joelho * a + perimetro_braco * b + c
+
+def calcular_percentual_gordura_vec(soma_dobras: np.ndarray, sexo_mask: np.ndarray,
+                                    tanner: np.ndarray, raca_mask: np.ndarray) -> np.ndarray:
+    """Versão vetorizada de calcular_percentual_gordura (sexo_mask True = masculino, raca_mask True = branca)"""
+    soma_dobras = np.asarray(soma_dobras, dtype=np.float64)
+    tanner = np.asarray(tanner)
+    if np.any(soma_dobras <= 0):
+        raise ValueError("Soma de dobras deve ser positiva")
+    if not np.all(np.isin(tanner, (1, 2, 3, 4, 5))):
+        raise ValueError("Estágio de Tanner deve ser entre 1 e 5")
+    sexo_mask = np.asarray(sexo_mask, dtype=bool)
+    raca_mask = np.asarray(raca_mask, dtype=bool)
+
+    quad_masc = 1.21 * soma_dobras - 0.008 * soma_dobras * soma_dobras
+    quad_fem = 1.33 * soma_dobras - 0.013 * soma_dobras * soma_dobras - 2.5
+    pre_puber = tanner <= 2
+    puber = tanner == 3
+    offset = np.select(
+        [raca_mask & pre_puber, raca_mask & puber, raca_mask,
+         pre_puber, puber],
+        [-1.7, -3.4, -5.5, -3.2, -5.2],
+        default=-6.8,
+    )
+    ate_35 = np.where(sexo_mask, quad_masc + offset, quad_fem)
+    acima_35 = np.where(sexo_mask, 0.783 * soma_dobras + 1.6, 0.546 * soma_dobras + 9.7)
+    return np.where(soma_dobras > 35, acima_35, ate_35)
+
+def calcular_circ_muscular_braco_vec(perimetro_braco: np.ndarray, dobra_tricipital: np.ndarray) -> np.ndarray:
+    """Versão vetorizada de calcular_circ_muscular_braco"""
+    perimetro_braco = np.asarray(perimetro_braco, dtype=np.float64)
+    dobra_tricipital = np.asarray(dobra_tricipital, dtype=np.float64)
+    if np.any(perimetro_braco <= 0) or np.any(dobra_tricipital <= 0):
+        raise ValueError("Medidas devem ser positivas")
+    return perimetro_braco - 0.314 * (dobra_tricipital * 0.1)
+
+def calcular_area_gorda_braco_vec(circunferencia_braco: np.ndarray, area_muscular_braco: np.ndarray) -> np.ndarray:
+    """Versão vetorizada de calcular_area_gorda_braco"""
+    circunferencia_braco = np.asarray(circunferencia_braco, dtype=np.float64)
+    area_muscular_braco = np.asarray(area_muscular_braco, dtype=np.float64)
+    if np.any(circunferencia_braco <= 0) or np.any(area_muscular_braco <= 0):
+        raise ValueError("Medidas devem ser positivas")
+    return 0.79 * _INV_PI_APPROX_SQ * circunferencia_braco * circunferencia_braco - area_muscular_braco
+
+def calcular_area_muscular_braco_vec(circunferencia_braco: np.ndarray, dobra_tricipital: np.ndarray) -> np.ndarray:
+    """Versão vetorizada de calcular_area_muscular_braco"""
+    circunferencia_braco = np.asarray(circunferencia_braco, dtype=np.float64)
+    dobra_tricipital = np.asarray(dobra_tricipital, dtype=np.float64)
+    if np.any(circunferencia_braco <= 0) or np.any(dobra_tricipital <= 0):
+        raise ValueError("Medidas devem ser positivas")
+    # 0.314 * (dobra em mm / 10) == 0.0314 * dobra em mm
+    d = circunferencia_braco - 0.0314 * dobra_tricipital
+    return d * d * _INV_1256
+
+def estimar_estatura_paralisia_cerebral_vec(comprimento_superior: np.ndarray, comprimento_tibial: np.ndarray,
+                                            comprimento_joelho: np.ndarray) -> dict[str, np.ndarray]:
+    """Versão vetorizada de estimar_estatura_paralisia_cerebral (mesmas chaves, um array por método)"""
+    comprimento_superior = np.asarray(comprimento_superior, dtype=np.float64)
+    comprimento_tibial = np.asarray(comprimento_tibial, dtype=np.float64)
+    comprimento_joelho = np.asarray(comprimento_joelho, dtype=np.float64)
+    if (np.any(comprimento_superior <= 0) or np.any(comprimento_tibial <= 0)
+            or np.any(comprimento_joelho <= 0)):
+        raise ValueError("Medidas devem ser positivas")
+    return {
+        'Estimada_CT': 3.26 * comprimento_tibial + 30.8 + 1.4,
+        'Estimada_CS': 4.35 * comprimento_superior + 21.8 + 1.7,
+        'Estimada_CJ': 2.69 * comprimento_joelho + 24.2 + 1.1
+    }
 
 # --- INTERFACE STREAMLIT ---
+# pandas e plotly só são importados na primeira tela que monta tabela/gráfico
+@functools.cache
+def _go():
+    import plotly.graph_objects as go
+    return go
+
+@functools.cache
+def _pd():
+    import pandas as pd
+    return pd
+
+# Tabelas estáticas: montadas uma única vez, na primeira exibição (pandas é carregado sob demanda)
+@functools.cache
+def _referencia_peso_crianca():
+    return _pd().DataFrame({
+        'Idade': ['6-8 anos', '9-11 anos', '12-14 anos', '15-18 anos'],
+        'Peso Esperado (kg)': ['20-25', '25-35', '35-50', '50-70']
+    })
+
+@functools.cache
+def _referencia_pc_5_11():
+    return _pd().DataFrame({
+        'Nível de Atividade': NIVEL_OPTIONS,
+        'Fórmula': ['13.9 x altura', '10 x altura', '11.1 x altura']
+    })
+
+# Colunas da tabela de entrada em lote (estatura PC 2-12 anos) e linhas pré-alocadas
+# Faixas válidas (cm) de cada coluna: limitam o editor e são reaplicadas com np.clip no cálculo
+LIMITES_LOTE_PC: Final[dict[str, tuple[float, float]]] = {
+    "Comprimento Superior (cm)": (5.0, 40.0),
+    "Comprimento Tibial (cm)": (5.0, 40.0),
+    "Comprimento do Joelho (cm)": (5.0, 30.0),
+}
+_COLUNAS_LOTE_PC = tuple(LIMITES_LOTE_PC)
+_MIN_LOTE_PC, _MAX_LOTE_PC = np.array(list(LIMITES_LOTE_PC.values())).T
+_LINHAS_LOTE_PC = 5
+
+@functools.cache
+def _medidas_lote_pc_iniciais():
+    medidas = np.full((_LINHAS_LOTE_PC, len(_COLUNAS_LOTE_PC)), np.nan)
+    medidas[0] = (20.0, 20.0, 15.0)
+    return _pd().DataFrame(medidas, columns=list(_COLUNAS_LOTE_PC))
+
+_CALC_OPTIONS = (
+    "Peso Ajustado",
+    "Perda de Peso (%)",
+    "Estimativa de Peso (criança/adolescente)",
+    "Estimativa de Estatura pela Tíbia",
+    "Estimativa de Estatura pela Ulna",
+    "Correção de Prematuridade",
+    "Percentual de Gordura Corporal",
+    "Circunferência Muscular do Braço (CMB)",
+    "Área Gorda do Braço (AGB)",
+    "Área Muscular do Braço (AMB)",
+    "Estatura - Paralisia Cerebral (2-12 anos)",
+    "Estatura - Paralisia Cerebral em Lote",
+    "Estatura Adolescente com Paralisia Cerebral",
+    "Peso Corrigido para Amputação",
+    "Gasto Energético Total (GET)",
+    "Requerimento Energético Crianças/Adolescentes",
+    "Taxa Metabólica Basal (TMB)",
+    "Necessidades Nutricionais Paralisia Cerebral",
+    "Necessidade Energética PC 5-11 anos",
+    "Necessidade Energética PC Estável",
+    "Necessidade Energética PC Geral",
+    "Necessidade Energética Síndrome de Down",
+    "GEB Criança Criticamente Enferma",
+    "TMB Schofield para Crianças Gravemente Doentes",
+)
+
+_CSS = """
+<style>
+.main {
+    background-color: #f8f9fa;
+}
+.sidebar .sidebar-content {
+    background-color: #e9ecef;
+}
+.stButton>button, .stFormSubmitButton>button {
+    background-color: #4CAF50;
+    color: white;
+    border-radius: 5px;
+}
+.stButton>button:hover, .stFormSubmitButton>button:hover {
+    background-color: #45a049;
+}
+.stAlert {
+    border-radius: 10px;
+}
+</style>
+"""
+
+# Idades (anos) das curvas de projeção de crescimento
+_IDADES_PROJ = np.arange(2, 19)
+
+# Histórico guardado na sessão (limitado) e quantos itens aparecem na sidebar
+_HISTORICO_MAX = 200
+_HISTORICO_EXIBIDO = 5
+_HISTORICO_COLUNAS = ('tipo', 'resultado', 'data')
+
+_COND_LABELS = {Condicao.OBESIDADE: "Obesidade", Condicao.DESNUTRICAO: "Desnutrição"}
+
+def _enum_label(membro: Enum) -> str:
+    """Rótulo exibido nos selectbox de enums (ex.: Sexo.MASCULINO -> "Masculino")"""
+    return membro.name.capitalize()
+
+@st.cache_resource
+def _inject_css() -> str:
+    """Bloco <style> da página, montado uma única vez por processo"""
+    return _CSS
+
+@st.cache_data(max_entries=32)
+def _render_history(ultimos: tuple) -> str:
+    """Monta o bloco do histórico a partir de tuplas (tipo, resultado, timestamp Unix)"""
+    return "\n\n".join(
+        f"{tipo}: {resultado:.2f} ({datetime.fromtimestamp(data).strftime('%d/%m %H:%M')})"
+        for tipo, resultado, data in ultimos
+    )
+
+# --- TELAS DE CÁLCULO ---
+# Cada tela é descrita por um CalcSpec (campos de entrada, função de cálculo,
+# texto do resultado e extras opcionais) e desenhada pelo driver _run_calc.
+@dataclass(frozen=True)
+class InputSpec:
+    """Campo de entrada de uma tela; name é o argumento repassado a CalcSpec.fn"""
+    name: str
+    label: str
+    widget: Callable[..., Any]
+    kwargs: dict[str, Any] = field(default_factory=dict)
+    column: int | None = None   # None = largura total, fora das colunas
+
+    def render(self) -> Any:
+        return self.widget(self.label, **self.kwargs)
+
+@dataclass(frozen=True)
+class CalcSpec:
+    """Descrição declarativa de uma tela de cálculo"""
+    inputs: tuple[InputSpec, ...]
+    fn: Callable[..., Any]
+    label: str | None                 # ex.: "**Peso Ajustado:** {:.2f} kg"
+    button: str
+    primary: bool = False
+    subheader: str | None = None
+    note: str | None = None           # st.info exibido antes dos campos
+    details: Callable[[dict[str, Any], Any], None] | None = None
+    reference: str | None = None      # st.info exibido após o resultado
+    chart: Callable[[dict[str, Any], Any], None] | None = None
+    history_value: Callable[[Any], float] | None = None
+    registrar_historico: bool = True
+    sem_resultado: str = "Não foi possível calcular com os dados informados"  # erro quando fn retorna None
+
+def _numero(name: str, label: str, min_value: float, max_value: float, value: float,
+            step: float, column: int | None = None) -> InputSpec:
+    return InputSpec(name, label, st.number_input,
+                     dict(min_value=min_value, max_value=max_value, value=value, step=step), column)
+
+def _opcao(name: str, label: str, options: Sequence[Any], column: int | None = None,
+           format_func: Callable[[Any], str] | None = None) -> InputSpec:
+    kwargs: dict[str, Any] = {"options": options}
+    if format_func is not None:
+        kwargs["format_func"] = format_func
+    return InputSpec(name, label, st.selectbox, kwargs, column)
+
+def _sexo(column: int | None = None) -> InputSpec:
+    return _opcao("sexo", "Sexo", SEXO_OPTIONS, column, _enum_label)
+
+def _raca(column: int | None = None) -> InputSpec:
+    return _opcao("raca", "Raça", RACA_OPTIONS, column, _enum_label)
+
+def _editor_tabela(label: str, data: Callable[[], Any], **kwargs: Any) -> Any:
+    st.caption(label)
+    return st.data_editor(data(), **kwargs)
+
+def _tabela(name: str, label: str, data: Callable[[], Any], column_config: dict[str, Any]) -> InputSpec:
+    """Tabela editável; data é um getter para que o pandas só seja importado ao exibir"""
+    return InputSpec(name, label, _editor_tabela,
+                     {"data": data, "column_config": column_config, "num_rows": "dynamic", "hide_index": True})
+
+def _novo_historico(maxlen: int | None = _HISTORICO_MAX) -> dict[str, deque]:
+    """Histórico em colunas (struct-of-arrays): uma deque por campo"""
+    return {coluna: deque(maxlen=maxlen) for coluna in _HISTORICO_COLUNAS}
+
+def _append_history(pending: dict[str, deque], tipo: str, resultado: float,
+                    now: float | None = None) -> None:
+    """Enfileira um cálculo em `pending`; main() grava tudo no histórico ao final do rerun"""
+    pending['tipo'].append(tipo)
+    pending['resultado'].append(resultado)
+    pending['data'].append(now if now is not None else time.time())
+
+def _render_inputs(inputs: tuple[InputSpec, ...]) -> dict[str, Any]:
+    """Desenha os campos, agrupando em st.columns os que têm coluna definida"""
+    valores: dict[str, Any] = {}
+    for em_colunas, grupo in itertools.groupby(inputs, key=lambda w: w.column is not None):
+        grupo = list(grupo)
+        if not em_colunas:
+            for w in grupo:
+                valores[w.name] = w.render()
+            continue
+        cols = st.columns(max(w.column for w in grupo) + 1)
+        for w in grupo:
+            with cols[w.column]:
+                valores[w.name] = w.render()
+    return valores
+
+def _run_calc(calculo_selecionado: str, spec: CalcSpec, pending: dict[str, deque],
+              now: float | None = None) -> None:
+    """Driver genérico: form de campos -> envio -> cálculo -> resultado -> histórico"""
+    if spec.subheader:
+        st.subheader(spec.subheader)
+    if spec.note:
+        st.info(spec.note)
+    # Campos dentro de um form: ajustes nos widgets não disparam rerun até o envio
+    with st.form(f"form_{calculo_selecionado}"):
+        valores = _render_inputs(spec.inputs)
+        enviado = st.form_submit_button(spec.button, type="primary" if spec.primary else "secondary")
+    if not enviado:
+        return
+    resultado = spec.fn(**valores)
+    if resultado is None:
+        st.error(spec.sem_resultado)
+        return
+    if spec.label:
+        st.success(spec.label.format(resultado))
+    if spec.details:
+        spec.details(valores, resultado)
+    if spec.reference:
+        st.info(spec.reference)
+    if spec.chart:
+        spec.chart(valores, resultado)
+    if spec.registrar_historico:
+        _append_history(pending, calculo_selecionado,
+                        spec.history_value(resultado) if spec.history_value else resultado,
+                        now)
+
+# Detalhes exibidos após o resultado
+def _detalhes_perda_peso(valores: dict[str, Any], resultado: float) -> None:
+    if resultado < 5:
+        classificacao = "Perda insignificante"
+        cor = "green"
+    elif 5 <= resultado < 10:
+        classificacao = "Perda moderada"
+        cor = "orange"
+    else:
+        classificacao = "Perda grave"
+        cor = "red"
+    st.markdown(f"**Classificação:** <span style='color:{cor}'>{classificacao}</span>", unsafe_allow_html=True)
+
+def _detalhes_peso_crianca(valores: dict[str, Any], resultado: float) -> None:
+    st.dataframe(_referencia_peso_crianca(), hide_index=True)
+
+def _detalhes_percentual_gordura(valores: dict[str, Any], resultado: float) -> None:
+    if valores['sexo'] == Sexo.MASCULINO:
+        if resultado < 8: classificacao = "Muito baixo"
+        elif 8 <= resultado < 15: classificacao = "Normal"
+        elif 15 <= resultado < 20: classificacao = "Moderado"
+        else: classificacao = "Alto"
+    else:
+        if resultado < 15: classificacao = "Muito baixo"
+        elif 15 <= resultado < 25: classificacao = "Normal"
+        elif 25 <= resultado < 30: classificacao = "Moderado"
+        else: classificacao = "Alto"
+    st.success(f"**Classificação:** {classificacao}")
+
+def _detalhes_circ_muscular_braco(valores: dict[str, Any], resultado: float) -> None:
+    if resultado < 15:
+        status = "Desnutrição grave"
+    elif 15 <= resultado < 20:
+        status = "Desnutrição moderada"
+    elif 20 <= resultado < 25:
+        status = "Normal"
+    else:
+        status = "Adequado"
+    st.success(f"**Avaliação:** {status}")
+
+def _pct_amb(r: float) -> int:
+    """Percentil estimado da AMB (50 cm² = 100º), limitado a 100"""
+    v = r * 2.0
+    return 100 if v >= 100.0 else int(v)
+
+def _detalhes_area_muscular_braco(valores: dict[str, Any], resultado: float) -> None:
+    st.success(f"**Percentil Estimado:** {_pct_amb(resultado)}º")
+
+def _media_estimativas(resultados: dict[str, float]) -> float:
+    cs, ct, cj = resultados['Estimada_CS'], resultados['Estimada_CT'], resultados['Estimada_CJ']
+    return (cs + ct + cj) * (1.0 / 3.0)
+
+_EST_TEMPLATE = (
+    "**Estimativas:**\n"
+    "- Por comprimento superior: {cs:.1f} cm\n"
+    "- Por comprimento tibial: {ct:.1f} cm\n"
+    "- Por comprimento do joelho: {cj:.1f} cm\n"
+)
+
+def _detalhes_estatura_paralisia_cerebral(valores: dict[str, Any], resultados: dict[str, float]) -> None:
+    st.success(_EST_TEMPLATE.format(cs=resultados['Estimada_CS'], ct=resultados['Estimada_CT'],
+                                    cj=resultados['Estimada_CJ']))
+    st.success(f"**Média das Estimativas:** {_media_estimativas(resultados):.1f} cm")
+
+def _detalhes_peso_corrigido_amputacao(valores: dict[str, Any], resultado: float) -> None:
+    membro = valores['membro_amputado']
+    st.info(f"**Percentual considerado:** {PROPORCOES_AMPUTACAO[membro]}% ({membro})")
+
+def _fator_get(valores: dict[str, Any]) -> tuple[str, float]:
+    """Fator efetivamente aplicado no GET: valores 1.0 contam como não preenchidos"""
+    if valores['fator_atividade'] > 1.0:
+        return "Atividade Física", valores['fator_atividade']
+    if valores['fator_estresse'] > 1.0:
+        return "Estresse", valores['fator_estresse']
+    return "Basal", 1.0
+
+def _calcular_get(ere: float, fator_atividade: float, fator_estresse: float) -> float:
+    if fator_atividade > 1.0 and fator_estresse > 1.0:
+        raise ValueError("Preencha apenas um fator adicional (atividade OU estresse)")
+    return calcular_gasto_energetico_total(
+        ere,
+        fator_atividade=fator_atividade if fator_atividade > 1.0 else None,
+        fator_estresse=fator_estresse if fator_estresse > 1.0 else None,
+    )
+
+def _detalhes_gasto_energetico_total(valores: dict[str, Any], resultado: float) -> None:
+    tipo, valor = _fator_get(valores)
+    st.info(f"**Fator aplicado:** {tipo} (x{valor:.2f})")
+
+def _detalhes_tmb(valores: dict[str, Any], resultado: float) -> None:
+    peso, idade = valores['peso'], valores['idade']
+    if idade > 18:
+        a, b, c, h, d = HB_COEFS[valores['sexo']]
+        hb = a + b * peso + c * h - d * idade
+        st.info(f"**Harris-Benedict estimado:** {hb:.2f} kcal/dia (para adulto)")
+
+def _detalhes_necessidade_pc_5_11(valores: dict[str, Any], resultado: float) -> None:
+    st.dataframe(_referencia_pc_5_11(), hide_index=True)
+
+def _estatura_pc_lote(medidas: Any) -> Any:
+    """Estimativas de estatura PC (2-12 anos) para todas as linhas completas da tabela"""
+    # Linhas numeradas pela posição na tabela (o índice do editor fica com lacunas ao excluir linhas)
+    valores = medidas[list(_COLUNAS_LOTE_PC)].to_numpy(dtype=np.float64)
+    vazias = np.isnan(valores)
+    completas = ~vazias.any(axis=1)
+    incompletas = np.flatnonzero(vazias.any(axis=1) & ~vazias.all(axis=1)) + 1
+    if len(incompletas):
+        st.warning("Linhas incompletas foram ignoradas: " + ", ".join(map(str, incompletas)))
+    linhas = np.flatnonzero(completas) + 1
+    if not len(linhas):
+        raise ValueError("Preencha ao menos uma linha completa da tabela")
+    # Valores colados fora da faixa são limitados de uma vez, coluna a coluna, e avisados
+    brutas = valores[completas]
+    limitadas = np.clip(brutas, _MIN_LOTE_PC, _MAX_LOTE_PC)
+    ajustadas = linhas[(limitadas != brutas).any(axis=1)]
+    if len(ajustadas):
+        st.warning("Medidas fora da faixa válida foram limitadas nas linhas: " + ", ".join(map(str, ajustadas)))
+    cs, ct, cj = limitadas.T
+    est = estimar_estatura_paralisia_cerebral_vec(cs, ct, cj)
+    return _pd().DataFrame({
+        'Paciente': linhas,   # número da linha na tabela
+        'Por comp. superior (cm)': est['Estimada_CS'],
+        'Por comp. tibial (cm)': est['Estimada_CT'],
+        'Por comp. do joelho (cm)': est['Estimada_CJ'],
+        'Média (cm)': (est['Estimada_CS'] + est['Estimada_CT'] + est['Estimada_CJ']) * (1.0 / 3.0),
+    })
+
+def _detalhes_estatura_pc_lote(valores: dict[str, Any], resultados: Any) -> None:
+    st.success(f"**Pacientes estimados:** {len(resultados)}")
+    st.dataframe(resultados.round(1), hide_index=True)
+
+def _detalhes_necessidade_pc_geral(valores: dict[str, Any], resultado: float) -> None:
+    st.info(f"**Fórmula utilizada:** {FORMULA_PC_BY_SEX[valores['sexo']]}")
+
+def _detalhes_sindrome_down(valores: dict[str, Any], resultado: float) -> None:
+    tipico = SD_COEF_BY_SEX[valores['sexo']] * valores['altura'] * 1.15  # +15% para crianças típicas
+    st.info(f"**Comparação com criança típica:** ~{tipico:.2f} kcal/dia (+15%)")
+
+def _detalhes_tmb_schofield(valores: dict[str, Any], resultado: float) -> None:
+    tmb_normal = calcular_tmb(valores['peso'], valores['idade'], valores['sexo'])
+    if tmb_normal:
+        diferenca = resultado - tmb_normal
+        percentual = (diferenca / tmb_normal) * 100
+        st.info(f"**Comparação com TMB padrão:** {tmb_normal:.2f} kcal/dia ({diferenca:+.2f} kcal, {percentual:+.2f}%)")
+
+# Gráficos: as figuras são montadas por builders em st.cache_data, chaveados
+# pelos poucos floats de que dependem; cliques repetidos reusam a figura.
+# Usa plotly.graph_objects direto (sem o DataFrame intermediário do plotly.express)
+# e arrays float32, serializados como typed arrays em base64.
+_CORES = ('#636efa', '#EF553B', '#00cc96')
+
+@st.cache_resource
+def _plot_template() -> str:
+    """Registra uma única vez o template "nutri" (base plotly, margens e fonte do app)"""
+    import plotly.io as pio
+    tpl = _go().layout.Template(pio.templates["plotly"])
+    tpl.layout.update(margin={'l': 40, 'r': 10, 't': 40, 'b': 40}, font={'size': 12})
+    pio.templates["nutri"] = tpl
+    return "nutri"
+
+def _figura(trace: Any, title: str, x_label: str | None = None, y_label: str | None = None) -> go.Figure:
+    return _go().Figure(trace, layout={
+        'template': _plot_template(),
+        'title': {'text': title},
+        'xaxis': {'title': {'text': x_label}},
+        'yaxis': {'title': {'text': y_label}},
+    })
+
+def _barras(x: Sequence[str], y: Any, title: str, x_label: str, y_label: str,
+            rotulos: bool = False) -> go.Figure:
+    y = np.asarray(y, dtype=np.float32)
+    trace = _go().Bar(x=list(x), y=y, marker_color=_CORES[:len(x)])
+    if rotulos:
+        trace.update(text=[f"{v:.2f}" for v in y], textposition='outside')
+    return _figura(trace, title, x_label, y_label)
+
+def _linha(x: np.ndarray, y: np.ndarray, title: str, x_label: str, y_label: str) -> go.Figure:
+    trace = _go().Scattergl(x=x.astype(np.float32), y=y.astype(np.float32), mode='lines')
+    return _figura(trace, title, x_label, y_label)
+
+@st.cache_data(max_entries=128)
+def _fig_peso_ajustado(peso_atual: float, peso_ideal: float, resultado: float) -> go.Figure:
+    return _barras(("Atual", "Ideal", "Ajustado"), (peso_atual, peso_ideal, resultado),
+                   "Comparação de Pesos", "Tipo", "Peso (kg)", rotulos=True)
+
+@st.cache_data(max_entries=128)
+def _fig_crescimento_tibia(comprimento_tibia: float) -> go.Figure:
+    estaturas = 3.26 * comprimento_tibia * _IDADES_PROJ * 0.1 + 30.8
+    return _linha(_IDADES_PROJ, estaturas, "Projeção de Crescimento", "Idade (anos)", "Estatura (cm)")
+
+@st.cache_data(max_entries=128)
+def _fig_composicao_braco(area_muscular: float, resultado: float) -> go.Figure:
+    trace = _go().Pie(labels=['Área Muscular', 'Área Gorda'],
+                      values=np.array([area_muscular, resultado], dtype=np.float32),
+                      marker_colors=_CORES[:2])
+    return _figura(trace, "Composição do Braço")
+
+@st.cache_data(max_entries=128)
+def _fig_crescimento(sex_flag: float, ulna: float) -> go.Figure:
+    estaturas = 30.35 + 1.29 * _IDADES_PROJ + 0.77 * sex_flag + 4.32 * ulna
+    return _linha(_IDADES_PROJ, estaturas, "Projeção de Crescimento", "Idade (anos)", "Estatura (cm)")
+
+@st.cache_data(max_entries=128)
+def _fig_peso_comparativo(peso_atual: float, resultado: float) -> go.Figure:
+    return _barras(("Atual", "Corrigido"), (peso_atual, resultado),
+                   "Comparação de Pesos", "Tipo", "Peso (kg)", rotulos=True)
+
+@st.cache_data(max_entries=128)
+def _fig_condicao_motora(altura: float) -> go.Figure:
+    return _barras(CONDICOES_MOTORAS, _KCAL_POR_CM_PC * altura, "Comparação por Condição Motora",
+                   "Condição Motora", "kcal/dia")
+
+@st.cache_data(max_entries=32)
+def _fig_estatura_pc_lote(pacientes: np.ndarray, medias: np.ndarray) -> go.Figure:
+    trace = _go().Scattergl(x=pacientes.astype(np.float32), y=medias.astype(np.float32), mode='markers')
+    return _figura(trace, "Estatura Média Estimada por Paciente", "Paciente", "Estatura (cm)")
+
+def _grafico_peso_ajustado(valores: dict[str, Any], resultado: float) -> None:
+    fig = _fig_peso_ajustado(valores['peso_atual'], valores['peso_ideal'], resultado)
+    st.plotly_chart(fig, use_container_width=True)
+
+def _grafico_estatura_tibia(valores: dict[str, Any], resultado: float) -> None:
+    st.plotly_chart(_fig_crescimento_tibia(valores['comprimento_tibia']), use_container_width=True)
+
+def _grafico_area_gorda_braco(valores: dict[str, Any], resultado: float) -> None:
+    fig = _fig_composicao_braco(valores['area_muscular_braco'], resultado)
+    st.plotly_chart(fig, use_container_width=True)
+
+def _grafico_estatura_paralisia_adolescente(valores: dict[str, Any], resultado: float) -> None:
+    sexo_bin = 1.0 if valores['sexo'] == Sexo.MASCULINO else 0.0
+    st.plotly_chart(_fig_crescimento(sexo_bin, valores['comprimento_ulna']), use_container_width=True)
+
+def _grafico_peso_corrigido_amputacao(valores: dict[str, Any], resultado: float) -> None:
+    st.plotly_chart(_fig_peso_comparativo(valores['peso_atual'], resultado), use_container_width=True)
+
+def _grafico_necessidade_pc_estaveis(valores: dict[str, Any], resultado: float) -> None:
+    st.plotly_chart(_fig_condicao_motora(valores['altura']), use_container_width=True)
+
+def _grafico_estatura_pc_lote(valores: dict[str, Any], resultados: Any) -> None:
+    fig = _fig_estatura_pc_lote(resultados['Paciente'].to_numpy(), resultados['Média (cm)'].to_numpy())
+    st.plotly_chart(fig, use_container_width=True)
+
+# Mensagem das telas cujas fórmulas só cobrem 0-18 anos (retornam None fora disso)
+_IDADE_FORA_DA_FAIXA = "Idade fora da faixa suportada (0-18 anos)"
+
+_SPECS: dict[str, CalcSpec] = {
+    "Peso Ajustado": CalcSpec(
+        inputs=(
+            _numero("peso_atual", "Peso Atual (kg)", 0.1, 300.0, 70.0, 0.1, column=0),
+            _numero("peso_ideal", "Peso Ideal (kg)", 0.1, 300.0, 65.0, 0.1, column=1),
+            _opcao("condicao", "Condição", CONDICAO_OPTIONS, format_func=_COND_LABELS.__getitem__),
+        ),
+        fn=calcular_peso_ajustado,
+        label="**Peso Ajustado:** {:.2f} kg",
+        button="Calcular Peso Ajustado", primary=True,
+        chart=_grafico_peso_ajustado,
+    ),
+    "Perda de Peso (%)": CalcSpec(
+        inputs=(
+            _numero("peso_usual", "Peso Usual (kg)", 0.1, 300.0, 70.0, 0.1, column=0),
+            _numero("peso_atual", "Peso Atual (kg)", 0.1, 300.0, 65.0, 0.1, column=1),
+        ),
+        fn=calcular_perda_peso,
+        label="**Perda Percentual de Peso:** {:.2f}%",
+        button="Calcular Perda de Peso", primary=True,
+        details=_detalhes_perda_peso,
+    ),
+    "Estimativa de Peso (criança/adolescente)": CalcSpec(
+        subheader="Estimativa para crianças e adolescentes (6-18 anos)",
+        inputs=(
+            _sexo(column=0),
+            _raca(column=0),
+            _numero("altura_joelho", "Altura do Joelho (cm)", 10.0, 60.0, 30.0, 0.1, column=1),
+            _numero("perimetro_braco", "Perímetro do Braço (cm)", 5.0, 40.0, 20.0, 0.1, column=1),
+        ),
+        fn=estimar_peso_crianca,
+        label="**Peso Estimado:** {:.2f} kg",
+        button="Calcular Peso Estimado",
+        details=_detalhes_peso_crianca,
+    ),
+    "Estimativa de Estatura pela Tíbia": CalcSpec(
+        inputs=(_numero("comprimento_tibia", "Comprimento da Tíbia (cm)", 10.0, 50.0, 30.0, 0.1),),
+        fn=estimar_estatura_tibia,
+        label="**Estatura Estimada:** {:.2f} cm",
+        button="Calcular Estatura",
+        chart=_grafico_estatura_tibia,
+    ),
+    "Estimativa de Estatura pela Ulna": CalcSpec(
+        inputs=(_numero("comprimento_ulna", "Comprimento da Ulna (cm)", 10.0, 40.0, 25.0, 0.1),),
+        fn=estimar_estatura_ulna,
+        label="**Estatura Estimada:** {:.2f} cm",
+        button="Calcular Estatura pela Ulna",
+        reference="""
+        **Referências:**
+        - Adulto masculino: 160-190 cm
+        - Adulto feminino: 150-175 cm
+        """,
+    ),
+    "Correção de Prematuridade": CalcSpec(
+        inputs=(
+            _numero("idade_cronologica_meses", "Idade Cronológica (meses)", 0.0, 60.0, 3.0, 0.1, column=0),
+            _numero("idade_gestacional_semanas", "Idade Gestacional (semanas)", 20.0, 42.0, 32.0, 0.1, column=1),
+        ),
+        fn=calcular_idade_corrigida,
+        label="**Idade Corrigida:** {:.2f} meses",
+        button="Calcular Idade Corrigida",
+        reference="""
+        **Marcos de Desenvolvimento por Idade:**
+        - 2 meses: Sorriso social
+        - 4 meses: Sustenta cabeça
+        - 6 meses: Senta sem apoio
+        - 9 meses: Engatinha
+        """,
+    ),
+    "Percentual de Gordura Corporal": CalcSpec(
+        inputs=(
+            _numero("soma_dobras", "Soma das Dobras Cutâneas (mm)", 5.0, 100.0, 30.0, 0.1, column=0),
+            _sexo(column=0),
+            _opcao("estagio_tanner", "Estágio de Tanner", [1, 2, 3, 4, 5], column=1),
+            _raca(column=1),
+        ),
+        fn=calcular_percentual_gordura,
+        label="**Percentual de Gordura:** {:.2f}%",
+        button="Calcular % Gordura",
+        details=_detalhes_percentual_gordura,
+    ),
+    "Circunferência Muscular do Braço (CMB)": CalcSpec(
+        inputs=(
+            _numero("perimetro_braco", "Perímetro do Braço (cm)", 5.0, 50.0, 25.0, 0.1, column=0),
+            _numero("dobra_tricipital", "Dobra Tricipital (mm)", 3.0, 40.0, 15.0, 0.1, column=1),
+        ),
+        fn=calcular_circ_muscular_braco,
+        label="**Circunferência Muscular do Braço:** {:.2f} cm",
+        button="Calcular CMB",
+        details=_detalhes_circ_muscular_braco,
+    ),
+    "Área Gorda do Braço (AGB)": CalcSpec(
+        inputs=(
+            _numero("circunferencia_braco", "Circunferência do Braço (cm)", 5.0, 50.0, 25.0, 0.1, column=0),
+            _numero("area_muscular_braco", "Área Muscular do Braço (cm²)", 5.0, 100.0, 30.0, 0.1, column=1),
+        ),
+        fn=calcular_area_gorda_braco,
+        label="**Área Gorda do Braço:** {:.2f} cm²",
+        button="Calcular AGB",
+        chart=_grafico_area_gorda_braco,
+    ),
+    "Área Muscular do Braço (AMB)": CalcSpec(
+        inputs=(
+            _numero("circunferencia_braco", "Circunferência do Braço (cm)", 5.0, 50.0, 25.0, 0.1, column=0),
+            _numero("dobra_tricipital", "Dobra Tricipital (mm)", 3.0, 40.0, 15.0, 0.1, column=1),
+        ),
+        fn=calcular_area_muscular_braco,
+        label="**Área Muscular do Braço:** {:.2f} cm²",
+        button="Calcular AMB",
+        details=_detalhes_area_muscular_braco,
+    ),
+    "Estatura - Paralisia Cerebral (2-12 anos)": CalcSpec(
+        note="Para crianças com paralisia cerebral de 2 a 12 anos",
+        inputs=(
+            _numero("comprimento_superior", "Comprimento Superior (cm)", 5.0, 40.0, 20.0, 0.1, column=0),
+            _numero("comprimento_tibial", "Comprimento Tibial (cm)", 5.0, 40.0, 20.0, 0.1, column=1),
+            _numero("comprimento_joelho", "Comprimento do Joelho (cm)", 5.0, 30.0, 15.0, 0.1, column=2),
+        ),
+        fn=estimar_estatura_paralisia_cerebral,
+        label=None,
+        button="Calcular Estatura",
+        details=_detalhes_estatura_paralisia_cerebral,
+        history_value=_media_estimativas,
+    ),
+    "Estatura - Paralisia Cerebral em Lote": CalcSpec(
+        note="Para crianças com paralisia cerebral de 2 a 12 anos; uma linha por paciente",
+        inputs=(
+            _tabela("medidas", "Medidas dos pacientes", _medidas_lote_pc_iniciais, {
+                coluna: st.column_config.NumberColumn(min_value=lo, max_value=hi, step=0.1)
+                for coluna, (lo, hi) in LIMITES_LOTE_PC.items()
+            }),
+        ),
+        fn=_estatura_pc_lote,
+        label=None,
+        button="Calcular Estaturas",
+        details=_detalhes_estatura_pc_lote,
+        chart=_grafico_estatura_pc_lote,
+        registrar_historico=False,   # o lote não tem um único resultado clínico
+    ),
+    "Estatura Adolescente com Paralisia Cerebral": CalcSpec(
+        inputs=(
+            _numero("idade", "Idade (anos)", 2.0, 30.0, 15.0, 0.1, column=0),
+            _sexo(column=0),
+            _numero("comprimento_ulna", "Comprimento da Ulna (cm)", 10.0, 40.0, 25.0, 0.1, column=1),
+        ),
+        fn=estimar_estatura_paralisia_adolescente,
+        label="**Estatura Estimada:** {:.1f} cm",
+        button="Calcular Estatura",
+        chart=_grafico_estatura_paralisia_adolescente,
+    ),
+    "Peso Corrigido para Amputação": CalcSpec(
+        subheader="Correção de Peso para Pacientes Amputados",
+        inputs=(
+            _numero("peso_atual", "Peso Atual (kg)", 10.0, 300.0, 70.0, 0.1, column=0),
+            _opcao("membro_amputado", "Membro Amputado", list(PROPORCOES_AMPUTACAO), column=1),
+        ),
+        fn=lambda peso_atual, membro_amputado: calcular_peso_corrigido_amputacao(
+            peso_atual, PROPORCOES_AMPUTACAO[membro_amputado]),
+        label="**Peso Corrigido Estimado:** {:.2f} kg",
+        button="Calcular Peso Corrigido",
+        details=_detalhes_peso_corrigido_amputacao,
+        chart=_grafico_peso_corrigido_amputacao,
+    ),
+    "Gasto Energético Total (GET)": CalcSpec(
+        subheader="Cálculo do Gasto Energético Total",
+        note="**Fatores Adicionais (preencher apenas um)**",
+        inputs=(
+            _numero("ere", "Taxa Metabólica Basal (kcal)", 500.0, 5000.0, 1500.0, 10.0),
+            _numero("fator_atividade", "Fator de Atividade Física", 1.0, 2.5, 1.2, 0.1, column=0),
+            _numero("fator_estresse", "Fator de Estresse", 1.0, 2.5, 1.0, 0.1, column=1),
+        ),
+        fn=_calcular_get,
+        label="**Gasto Energético Total:** {:.2f} kcal",
+        button="Calcular GET",
+        details=_detalhes_gasto_energetico_total,
+    ),
+    "Requerimento Energético Crianças/Adolescentes": CalcSpec(
+        subheader="Cálculo para Crianças e Adolescentes",
+        inputs=(
+            _numero("idade", "Idade (anos)", 0.0, 18.0, 5.0, 0.1, column=0),
+            _numero("peso", "Peso (kg)", 1.0, 150.0, 20.0, 0.1, column=0),
+            _numero("estatura", "Estatura (metros)", 0.3, 2.5, 1.1, 0.01, column=1),
+            _sexo(column=1),
+            _numero("fator_atividade", "Fator de Atividade", 1.0, 2.0, 1.2, 0.1, column=1),
+        ),
+        fn=calcular_requerimento_energetico,
+        sem_resultado=_IDADE_FORA_DA_FAIXA,
+        label="**Requerimento Energético Estimado:** {:.2f} kcal/dia",
+        button="Calcular Requerimento",
+        reference="""
+        **Referências Diárias:**
+        - 1-3 anos: 1,000-1,400 kcal
+        - 4-8 anos: 1,200-2,000 kcal
+        - 9-13 anos: 1,600-2,600 kcal
+        - 14-18 anos: 1,800-3,200 kcal
+        """,
+    ),
+    "Taxa Metabólica Basal (TMB)": CalcSpec(
+        subheader="Cálculo da Taxa Metabólica Basal",
+        inputs=(
+            _numero("peso", "Peso (kg)", 1.0, 300.0, 70.0, 0.1, column=0),
+            _numero("idade", "Idade (anos)", 0.0, 120.0, 30.0, 0.1, column=0),
+            _sexo(column=1),
+        ),
+        fn=calcular_tmb,
+        sem_resultado=_IDADE_FORA_DA_FAIXA,
+        label="**Taxa Metabólica Basal:** {:.2f} kcal/dia",
+        button="Calcular TMB",
+        details=_detalhes_tmb,
+    ),
+    "Necessidades Nutricionais Paralisia Cerebral": CalcSpec(
+        subheader="Para Crianças com Paralisia Cerebral",
+        inputs=(
+            _numero("peso", "Peso (kg)", 1.0, 100.0, 15.0, 0.1, column=0),
+            _numero("altura", "Altura (metros)", 0.3, 2.0, 1.0, 0.01, column=0),
+            _sexo(column=1),
+            _numero("idade", "Idade (anos)", 0.0, 18.0, 5.0, 0.1, column=1),
+            _numero("fator_estresse", "Fator de Estresse", 1.0, 2.5, 1.2, 0.1, column=1),
+        ),
+        fn=calcular_necessidade_pc,
+        sem_resultado=_IDADE_FORA_DA_FAIXA,
+        label="**Necessidade Energética Estimada:** {:.2f} kcal/dia",
+        button="Calcular Necessidades",
+        reference="""
+        **Referências:**
+        - PC leve: 13-15 kcal/cm altura
+        - PC moderada: 10-12 kcal/cm altura
+        - PC grave: 8-10 kcal/cm altura
+        """,
+    ),
+    "Necessidade Energética PC 5-11 anos": CalcSpec(
+        subheader="Para Crianças com PC (5-11 anos)",
+        inputs=(
+            _numero("altura", "Altura (cm)", 50.0, 200.0, 120.0, 0.1),
+            _opcao("nivel_atividade", "Nível de Atividade", NIVEL_OPTIONS),
+        ),
+        fn=necessidade_energetica_pc_5_11,
+        label="**Necessidade Energética Estimada:** {:.2f} kcal/dia",
+        button="Calcular Necessidade",
+        details=_detalhes_necessidade_pc_5_11,
+    ),
+    "Necessidade Energética PC Estável": CalcSpec(
+        subheader="Para Crianças/Adolescentes com PC Estáveis",
+        inputs=(
+            _numero("altura", "Altura (cm)", 50.0, 200.0, 120.0, 0.1),
+            _opcao("condicao_motora", "Condição Motora", CONDICOES_MOTORAS),
+        ),
+        fn=necessidade_energetica_pc_estaveis,
+        label="**Necessidade Energética Estimada:** {:.2f} kcal/dia",
+        button="Calcular Necessidade",
+        chart=_grafico_necessidade_pc_estaveis,
+    ),
+    "Necessidade Energética PC Geral": CalcSpec(
+        subheader="Para Crianças com Paralisia Cerebral",
+        inputs=(
+            _numero("peso", "Peso (kg)", 1.0, 100.0, 15.0, 0.1, column=0),
+            _numero("altura", "Altura (cm)", 50.0, 200.0, 120.0, 0.1, column=0),
+            _numero("idade", "Idade (anos)", 0.0, 18.0, 5.0, 0.1, column=1),
+            _sexo(column=1),
+        ),
+        fn=necessidade_energetica_pc,
+        label="**Necessidade Energética Estimada:** {:.2f} kcal/dia",
+        button="Calcular Necessidade",
+        details=_detalhes_necessidade_pc_geral,
+    ),
+    "Necessidade Energética Síndrome de Down": CalcSpec(
+        subheader="Para Crianças com Síndrome de Down (5-12 anos)",
+        inputs=(
+            _numero("altura", "Altura (cm)", 50.0, 200.0, 120.0, 0.1),
+            _sexo(),
+        ),
+        fn=necessidade_sindrome_down,
+        label="**Necessidade Energética Estimada:** {:.2f} kcal/dia",
+        button="Calcular Necessidade",
+        details=_detalhes_sindrome_down,
+    ),
+    "GEB Criança Criticamente Enferma": CalcSpec(
+        subheader="Gasto Energético Basal para Crianças Enfermas",
+        inputs=(
+            _numero("idade_meses", "Idade (meses)", 0.0, 240.0, 12.0, 0.1, column=0),
+            _numero("peso", "Peso (kg)", 1.0, 100.0, 10.0, 0.1, column=0),
+            _numero("temp_c", "Temperatura (°C)", 30.0, 45.0, 37.0, 0.1, column=1),
+        ),
+        fn=geb_critica,
+        label="**Gasto Energético Basal Estimado:** {:.2f} kcal/dia",
+        button="Calcular GEB",
+        reference="""
+        **Fórmula utilizada:**
+        [(17 × idade em meses) + (48 × peso em kg) + (292 × temperatura em °C) - 9677] × 0.239
+        """,
+    ),
+    "TMB Schofield para Crianças Gravemente Doentes": CalcSpec(
+        subheader="TMB pela Equação de Schofield",
+        inputs=(
+            _numero("peso", "Peso (kg)", 1.0, 150.0, 15.0, 0.1, column=0),
+            _numero("estatura", "Estatura (cm)", 30.0, 200.0, 100.0, 0.1, column=0),
+            _numero("idade", "Idade (anos)", 0.0, 18.0, 5.0, 0.1, column=1),
+            _sexo(column=1),
+        ),
+        fn=lambda peso, estatura, idade, sexo: tmb_schofield(peso, estatura / 100, idade, sexo),
+        sem_resultado=_IDADE_FORA_DA_FAIXA,
+        label="**Taxa Metabólica Basal (Schofield):** {:.2f} kcal/dia",
+        button="Calcular TMB Schofield",
+        details=_detalhes_tmb_schofield,
+    ),
+}
+
 def main():
     st.set_page_config(
         page_title="Calculadora Nutricional Completa",
@@ -301,27 +1210,7 @@ def main():
     )
     
     # Configuração de estilo
-    st.markdown("""
-    <style>
-    .main {
-        background-color: #f8f9fa;
-    }
-    .sidebar .sidebar-content {
-        background-color: #e9ecef;
-    }
-    .stButton>button {
-        background-color: #4CAF50;
-        color: white;
-        border-radius: 5px;
-    }
-    .stButton>button:hover {
-        background-color: #45a049;
-    }
-    .stAlert {
-        border-radius: 10px;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    st.markdown(_inject_css(), unsafe_allow_html=True)
     
     # Sidebar com navegação
     with st.sidebar:
@@ -331,31 +1220,7 @@ def main():
         # Menu de navegação
         calculo_selecionado = st.selectbox(
             "Selecione o cálculo:",
-            options=[
-                "Peso Ajustado",
-                "Perda de Peso (%)",
-                "Estimativa de Peso (criança/adolescente)",
-                "Estimativa de Estatura pela Tíbia",
-                "Estimativa de Estatura pela Ulna",
-                "Correção de Prematuridade",
-                "Percentual de Gordura Corporal",
-                "Circunferência Muscular do Braço (CMB)",
-                "Área Gorda do Braço (AGB)",
-                "Área Muscular do Braço (AMB)",
-                "Estatura - Paralisia Cerebral (2-12 anos)",
-                "Estatura Adolescente com Paralisia Cerebral",
-                "Peso Corrigido para Amputação",
-                "Gasto Energético Total (GET)",
-                "Requerimento Energético Crianças/Adolescentes",
-                "Taxa Metabólica Basal (TMB)",
-                "Necessidades Nutricionais Paralisia Cerebral",
-                "Necessidade Energética PC 5-11 anos",
-                "Necessidade Energética PC Estável",
-                "Necessidade Energética PC Geral",
-                "Necessidade Energética Síndrome de Down",
-                "GEB Criança Criticamente Enferma",
-                "TMB Schofield para Crianças Gravemente Doentes"
-            ],
+            options=_CALC_OPTIONS,
             index=0
         )
         
@@ -367,13 +1232,22 @@ def main():
         st.subheader("📝 Histórico de Cálculos")
         
         if 'historico' not in st.session_state:
-            st.session_state.historico = []
+            st.session_state.historico = _novo_historico()
+        historico = st.session_state.historico
         
         if st.button("🧹 Limpar Histórico"):
-            st.session_state.historico = []
+            for coluna in historico.values():
+                coluna.clear()
         
-        for item in reversed(st.session_state.historico[-5:]):
-            st.sidebar.info(f"{item['tipo']}: {item['resultado']:.2f} ({item['data'].strftime('%d/%m %H:%M')})")
+        if historico['tipo']:
+            recentes = (itertools.islice(reversed(historico[c]), _HISTORICO_EXIBIDO)
+                        for c in _HISTORICO_COLUNAS)
+            ultimos = tuple(zip(*recentes))
+            st.sidebar.info(_render_history(ultimos))
+    
+    # Instante único do rerun e registros pendentes, gravados no histórico ao final
+    _now = time.time()
+    _pending_history = _novo_historico(maxlen=None)
     
     # Página principal
     st.title("🧮 " + calculo_selecionado)
@@ -381,739 +1255,18 @@ def main():
     # Container principal
     with st.container():
         try:
-            if calculo_selecionado == "Peso Ajustado":
-                col1, col2 = st.columns(2)
-                with col1:
-                    peso_atual = st.number_input("Peso Atual (kg)", min_value=0.1, max_value=300.0, value=70.0, step=0.1)
-                with col2:
-                    peso_ideal = st.number_input("Peso Ideal (kg)", min_value=0.1, max_value=300.0, value=65.0, step=0.1)
-                
-                condicao = st.selectbox("Condição", options=[c.value for c in Condicao], 
-                                      format_func=lambda x: "Obesidade" if x == "obesidade" else "Desnutrição")
-                
-                if st.button("Calcular Peso Ajustado", type="primary"):
-                    resultado = calcular_peso_ajustado(peso_atual, peso_ideal, Condicao(condicao))
-                    st.success(f"**Peso Ajustado:** {resultado:.2f} kg")
-                    
-                    # Gráfico comparativo
-                    dados = pd.DataFrame({
-                        "Tipo": ["Atual", "Ideal", "Ajustado"],
-                        "Peso (kg)": [peso_atual, peso_ideal, resultado]
-                    })
-                    
-                    fig = px.bar(dados, x="Tipo", y="Peso (kg)", color="Tipo", 
-                                title="Comparação de Pesos", text="Peso (kg)")
-                    fig.update_traces(texttemplate='%{text:.2f}', textposition='outside')
-                    st.plotly_chart(fig, use_container_width=True)
-                    
-                    # Adicionar ao histórico
-                    st.session_state.historico.append({
-                        'tipo': calculo_selecionado,
-                        'resultado': resultado,
-                        'data': datetime.now()
-                    })
-
-            elif calculo_selecionado == "Perda de Peso (%)":
-                col1, col2 = st.columns(2)
-                with col1:
-                    peso_usual = st.number_input("Peso Usual (kg)", min_value=0.1, max_value=300.0, value=70.0, step=0.1)
-                with col2:
-                    peso_atual = st.number_input("Peso Atual (kg)", min_value=0.1, max_value=300.0, value=65.0, step=0.1)
-                
-                if st.button("Calcular Perda de Peso", type="primary"):
-                    resultado = calcular_perda_peso(peso_usual, peso_atual)
-                    
-                    # Interpretação do resultado
-                    if resultado < 5:
-                        classificacao = "Perda insignificante"
-                        cor = "green"
-                    elif 5 <= resultado < 10:
-                        classificacao = "Perda moderada"
-                        cor = "orange"
-                    else:
-                        classificacao = "Perda grave"
-                        cor = "red"
-                    
-                    st.success(f"**Perda Percentual de Peso:** {resultado:.2f}%")
-                    st.markdown(f"**Classificação:** <span style='color:{cor}'>{classificacao}</span>", unsafe_allow_html=True)
-                    
-                    st.session_state.historico.append({
-                        'tipo': calculo_selecionado,
-                        'resultado': resultado,
-                        'data': datetime.now()
-                    })
-
-            elif calculo_selecionado == "Estimativa de Peso (criança/adolescente)":
-                st.subheader("Estimativa para crianças e adolescentes (6-18 anos)")
-                
-                col1, col2 = st.columns(2)
-                with col1:
-                    sexo = st.selectbox("Sexo", options=[s.value for s in Sexo])
-                    raca = st.selectbox("Raça", options=[r.value for r in Raca])
-                with col2:
-                    altura_joelho = st.number_input("Altura do Joelho (cm)", min_value=10.0, max_value=60.0, value=30.0, step=0.1)
-                    perimetro_braco = st.number_input("Perímetro do Braço (cm)", min_value=5.0, max_value=40.0, value=20.0, step=0.1)
-                
-                if st.button("Calcular Peso Estimado"):
-                    resultado = estimar_peso_crianca(
-                        altura_joelho, 
-                        perimetro_braco, 
-                        Sexo(sexo), 
-                        Raca(raca)
-                    )
-                    st.success(f"**Peso Estimado:** {resultado:.2f} kg")
-                    
-                    # Tabela de referência
-                    referencia = pd.DataFrame({
-                        'Idade': ['6-8 anos', '9-11 anos', '12-14 anos', '15-18 anos'],
-                        'Peso Esperado (kg)': ['20-25', '25-35', '35-50', '50-70']
-                    })
-                    st.dataframe(referencia, hide_index=True)
-                    
-                    st.session_state.historico.append({
-                        'tipo': calculo_selecionado,
-                        'resultado': resultado,
-                        'data': datetime.now()
-                    })
-
-            elif calculo_selecionado == "Estimativa de Estatura pela Tíbia":
-                comprimento_tibia = st.number_input("Comprimento da Tíbia (cm)", 
-                                                  min_value=10.0, max_value=50.0, value=30.0, step=0.1)
-                
-                if st.button("Calcular Estatura"):
-                    resultado = estimar_estatura_tibia(comprimento_tibia)
-                    st.success(f"**Estatura Estimada:** {resultado:.2f} cm")
-                    
-                    # Gráfico de crescimento
-                    idades = list(range(2, 19))
-                    estaturas = [3.26 * (comprimento_tibia * (i/10)) + 30.8 for i in idades]
-                    
-                    fig = px.line(
-                        x=idades, 
-                        y=estaturas,
-                        title="Projeção de Crescimento",
-                        labels={'x': 'Idade (anos)', 'y': 'Estatura (cm)'}
-                    )
-                    st.plotly_chart(fig, use_container_width=True)
-                    
-                    st.session_state.historico.append({
-                        'tipo': calculo_selecionado,
-                        'resultado': resultado,
-                        'data': datetime.now()
-                    })
-
-            elif calculo_selecionado == "Estimativa de Estatura pela Ulna":
-                comprimento_ulna = st.number_input("Comprimento da Ulna (cm)", 
-                                                 min_value=10.0, max_value=40.0, value=25.0, step=0.1)
-                
-                if st.button("Calcular Estatura pela Ulna"):
-                    resultado = estimar_estatura_ulna(comprimento_ulna)
-                    st.success(f"**Estatura Estimada:** {resultado:.2f} cm")
-                    
-                    # Comparação com referência
-                    st.info("""
-                    **Referências:**
-                    - Adulto masculino: 160-190 cm
-                    - Adulto feminino: 150-175 cm
-                    """)
-                    
-                    st.session_state.historico.append({
-                        'tipo': calculo_selecionado,
-                        'resultado': resultado,
-                        'data': datetime.now()
-                    })
-
-            elif calculo_selecionado == "Correção de Prematuridade":
-                col1, col2 = st.columns(2)
-                with col1:
-                    idade_cronologica = st.number_input("Idade Cronológica (meses)", 
-                                                       min_value=0.0, max_value=60.0, value=3.0, step=0.1)
-                with col2:
-                    idade_gestacional = st.number_input("Idade Gestacional (semanas)", 
-                                                      min_value=20.0, max_value=42.0, value=32.0, step=0.1)
-                
-                if st.button("Calcular Idade Corrigida"):
-                    resultado = calcular_idade_corrigida(idade_cronologica, idade_gestacional)
-                    st.success(f"**Idade Corrigida:** {resultado:.2f} meses")
-                    
-                    # Tabela de marcos de desenvolvimento
-                    st.info("""
-                    **Marcos de Desenvolvimento por Idade:**
-                    - 2 meses: Sorriso social
-                    - 4 meses: Sustenta cabeça
-                    - 6 meses: Senta sem apoio
-                    - 9 meses: Engatinha
-                    """)
-                    
-                    st.session_state.historico.append({
-                        'tipo': calculo_selecionado,
-                        'resultado': resultado,
-                        'data': datetime.now()
-                    })
-
-            elif calculo_selecionado == "Percentual de Gordura Corporal":
-                col1, col2 = st.columns(2)
-                with col1:
-                    soma_dobras = st.number_input("Soma das Dobras Cutâneas (mm)", 
-                                                min_value=5.0, max_value=100.0, value=30.0, step=0.1)
-                    sexo = st.selectbox("Sexo", options=[s.value for s in Sexo])
-                with col2:
-                    estagio_tanner = st.selectbox("Estágio de Tanner", options=[1, 2, 3, 4, 5])
-                    raca = st.selectbox("Raça", options=[r.value for r in Raca])
-                
-                if st.button("Calcular % Gordura"):
-                    resultado = calcular_percentual_gordura(
-                        soma_dobras, 
-                        Sexo(sexo), 
-                        estagio_tanner, 
-                        Raca(raca)
-                    )
-                    
-                    # Classificação
-                    if sexo == Sexo.MASCULINO.value:
-                        if resultado < 8: classificacao = "Muito baixo"
-                        elif 8 <= resultado < 15: classificacao = "Normal"
-                        elif 15 <= resultado < 20: classificacao = "Moderado"
-                        else: classificacao = "Alto"
-                    else:
-                        if resultado < 15: classificacao = "Muito baixo"
-                        elif 15 <= resultado < 25: classificacao = "Normal"
-                        elif 25 <= resultado < 30: classificacao = "Moderado"
-                        else: classificacao = "Alto"
-                    
-                    st.success(f"**Percentual de Gordura:** {resultado:.2f}%")
-                    st.success(f"**Classificação:** {classificacao}")
-                    
-                    st.session_state.historico.append({
-                        'tipo': calculo_selecionado,
-                        'resultado': resultado,
-                        'data': datetime.now()
-                    })
-
-            elif calculo_selecionado == "Circunferência Muscular do Braço (CMB)":
-                col1, col2 = st.columns(2)
-                with col1:
-                    perimetro_braco = st.number_input("Perímetro do Braço (cm)", 
-                                                    min_value=5.0, max_value=50.0, value=25.0, step=0.1)
-                with col2:
-                    dobra_tricipital = st.number_input("Dobra Tricipital (mm)", 
-                                                     min_value=3.0, max_value=40.0, value=15.0, step=0.1)
-                
-                if st.button("Calcular CMB"):
-                    resultado = calcular_circ_muscular_braco(perimetro_braco, dobra_tricipital)
-                    
-                    # Avaliação nutricional
-                    if resultado < 15:
-                        status = "Desnutrição grave"
-                    elif 15 <= resultado < 20:
-                        status = "Desnutrição moderada"
-                    elif 20 <= resultado < 25:
-                        status = "Normal"
-                    else:
-                        status = "Adequado"
-                    
-                    st.success(f"**Circunferência Muscular do Braço:** {resultado:.2f} cm")
-                    st.success(f"**Avaliação:** {status}")
-                    
-                    st.session_state.historico.append({
-                        'tipo': calculo_selecionado,
-                        'resultado': resultado,
-                        'data': datetime.now()
-                    })
-
-            elif calculo_selecionado == "Área Gorda do Braço (AGB)":
-                col1, col2 = st.columns(2)
-                with col1:
-                    circunferencia_braco = st.number_input("Circunferência do Braço (cm)", 
-                                                         min_value=5.0, max_value=50.0, value=25.0, step=0.1)
-                with col2:
-                    area_muscular = st.number_input("Área Muscular do Braço (cm²)", 
-                                                  min_value=5.0, max_value=100.0, value=30.0, step=0.1)
-                
-                if st.button("Calcular AGB"):
-                    resultado = calcular_area_gorda_braco(circunferencia_braco, area_muscular)
-                    st.success(f"**Área Gorda do Braço:** {resultado:.2f} cm²")
-                    
-                    # Gráfico de composição
-                    composicao = pd.DataFrame({
-                        'Componente': ['Área Muscular', 'Área Gorda'],
-                        'Valor (cm²)': [area_muscular, resultado]
-                    })
-                    
-                    fig = px.pie(composicao, values='Valor (cm²)', names='Componente',
-                                title="Composição do Braço")
-                    st.plotly_chart(fig, use_container_width=True)
-                    
-                    st.session_state.historico.append({
-                        'tipo': calculo_selecionado,
-                        'resultado': resultado,
-                        'data': datetime.now()
-                    })
-
-            elif calculo_selecionado == "Área Muscular do Braço (AMB)":
-                col1, col2 = st.columns(2)
-                with col1:
-                    circunferencia_braco = st.number_input("Circunferência do Braço (cm)", 
-                                                         min_value=5.0, max_value=50.0, value=25.0, step=0.1)
-                with col2:
-                    dobra_tricipital = st.number_input("Dobra Tricipital (mm)", 
-                                                     min_value=3.0, max_value=40.0, value=15.0, step=0.1)
-                
-                if st.button("Calcular AMB"):
-                    resultado = calcular_area_muscular_braco(circunferencia_braco, dobra_tricipital)
-                    
-                    # Classificação por percentis
-                    percentil = min(int((resultado / 50) * 100), 100)
-                    
-                    st.success(f"**Área Muscular do Braço:** {resultado:.2f} cm²")
-                    st.success(f"**Percentil Estimado:** {percentil}º")
-                    
-                    st.session_state.historico.append({
-                        'tipo': calculo_selecionado,
-                        'resultado': resultado,
-                        'data': datetime.now()
-                    })
-
-            elif calculo_selecionado == "Estatura - Paralisia Cerebral (2-12 anos)":
-                st.info("Para crianças com paralisia cerebral de 2 a 12 anos")
-                
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    comprimento_superior = st.number_input("Comprimento Superior (cm)", 
-                                                          min_value=5.0, max_value=40.0, value=20.0, step=0.1)
-                with col2:
-                    comprimento_tibial = st.number_input("Comprimento Tibial (cm)", 
-                                                        min_value=5.0, max_value=40.0, value=20.0, step=0.1)
-                with col3:
-                    comprimento_joelho = st.number_input("Comprimento do Joelho (cm)", 
-                                                        min_value=5.0, max_value=30.0, value=15.0, step=0.1)
-                
-                if st.button("Calcular Estatura"):
-                    resultados = estimar_estatura_paralisia_cerebral(
-                        comprimento_superior,
-                        comprimento_tibial,
-                        comprimento_joelho
-                    )
-                    
-                    st.success(f"""
-                    **Estimativas:**
-                    - Por comprimento superior: {resultados['Estimada_CS']:.1f} cm
-                    - Por comprimento tibial: {resultados['Estimada_CT']:.1f} cm
-                    - Por comprimento do joelho: {resultados['Estimada_CJ']:.1f} cm
-                    """)
-                    
-                    # Média das estimativas
-                    media = sum(resultados.values()) / len(resultados)
-                    st.success(f"**Média das Estimativas:** {media:.1f} cm")
-                    
-                    st.session_state.historico.append({
-                        'tipo': calculo_selecionado,
-                        'resultado': media,
-                        'data': datetime.now()
-                    })
-
-            elif calculo_selecionado == "Estatura Adolescente com Paralisia Cerebral":
-                col1, col2 = st.columns(2)
-                with col1:
-                    idade = st.number_input("Idade (anos)", min_value=2.0, max_value=30.0, value=15.0, step=0.1)
-                    sexo = st.selectbox("Sexo", options=[s.value for s in Sexo])
-                with col2:
-                    comprimento_ulna = st.number_input("Comprimento da Ulna (cm)", 
-                                                     min_value=10.0, max_value=40.0, value=25.0, step=0.1)
-                
-                if st.button("Calcular Estatura"):
-                    resultado = estimar_estatura_paralisia_adolescente(
-                        idade,
-                        Sexo(sexo),
-                        comprimento_ulna
-                    )
-                    
-                    st.success(f"**Estatura Estimada:** {resultado:.1f} cm")
-                    
-                    # Curva de crescimento
-                    idades = list(range(2, 19))
-                    estaturas = [30.35 + (1.29 * i) + (0.77 * (1 if sexo == Sexo.MASCULINO.value else 0)) + (4.32 * comprimento_ulna) for i in idades]
-                    
-                    fig = px.line(
-                        x=idades, 
-                        y=estaturas,
-                        title="Projeção de Crescimento",
-                        labels={'x': 'Idade (anos)', 'y': 'Estatura (cm)'}
-                    )
-                    st.plotly_chart(fig, use_container_width=True)
-                    
-                    st.session_state.historico.append({
-                        'tipo': calculo_selecionado,
-                        'resultado': resultado,
-                        'data': datetime.now()
-                    })
-
-            elif calculo_selecionado == "Peso Corrigido para Amputação":
-                st.subheader("Correção de Peso para Pacientes Amputados")
-                
-                col1, col2 = st.columns(2)
-                with col1:
-                    peso_atual = st.number_input("Peso Atual (kg)", 
-                                               min_value=10.0, max_value=300.0, value=70.0, step=0.1)
-                with col2:
-                    membro_amputado = st.selectbox("Membro Amputado", 
-                                                 ["Braço", "Antebraço", "Mão", "Coxa", "Perna", "Pé"])
-                
-                # Tabela de proporções padrão
-                proporcoes = {
-                    "Braço": 2.7,
-                    "Antebraço": 1.6,
-                    "Mão": 0.7,
-                    "Coxa": 10.1,
-                    "Perna": 4.4,
-                    "Pé": 1.5
-                }
-                
-                if st.button("Calcular Peso Corrigido"):
-                    percentual = proporcoes[membro_amputado]
-                    resultado = calcular_peso_corrigido_amputacao(peso_atual, percentual)
-                    
-                    st.success(f"**Peso Corrigido Estimado:** {resultado:.2f} kg")
-                    st.info(f"**Percentual considerado:** {percentual}% ({membro_amputado})")
-                    
-                    # Gráfico comparativo
-                    dados = pd.DataFrame({
-                        "Tipo": ["Atual", "Corrigido"],
-                        "Peso (kg)": [peso_atual, resultado]
-                    })
-                    
-                    fig = px.bar(dados, x="Tipo", y="Peso (kg)", color="Tipo",
-                                title="Comparação de Pesos", text="Peso (kg)")
-                    fig.update_traces(texttemplate='%{text:.2f}', textposition='outside')
-                    st.plotly_chart(fig, use_container_width=True)
-                    
-                    st.session_state.historico.append({
-                        'tipo': calculo_selecionado,
-                        'resultado': resultado,
-                        'data': datetime.now()
-                    })
-
-            elif calculo_selecionado == "Gasto Energético Total (GET)":
-                st.subheader("Cálculo do Gasto Energético Total")
-                
-                ere = st.number_input("Taxa Metabólica Basal (kcal)", 
-                                    min_value=500.0, max_value=5000.0, value=1500.0, step=10.0)
-                
-                st.markdown("**Fatores Adicionais (preencher apenas um)**")
-                col1, col2 = st.columns(2)
-                with col1:
-                    fator_atividade = st.number_input("Fator de Atividade Física", 
-                                                    min_value=1.0, max_value=2.5, value=1.2, step=0.1)
-                with col2:
-                    fator_estresse = st.number_input("Fator de Estresse", 
-                                                   min_value=1.0, max_value=2.5, value=1.0, step=0.1)
-                
-                if st.button("Calcular GET"):
-                    # Verifica qual fator usar
-                    usar_atividade = fator_atividade > 1.0
-                    usar_estresse = fator_estresse > 1.0
-                    
-                    if usar_atividade and usar_estresse:
-                        st.warning("Preencha apenas um fator adicional (atividade OU estresse)")
-                    else:
-                        if usar_atividade:
-                            resultado = calcular_gasto_energetico_total(ere, fator_atividade=fator_atividade)
-                            tipo = "Atividade Física"
-                            valor = fator_atividade
-                        elif usar_estresse:
-                            resultado = calcular_gasto_energetico_total(ere, fator_estresse=fator_estresse)
-                            tipo = "Estresse"
-                            valor = fator_estresse
-                        else:
-                            resultado = calcular_gasto_energetico_total(ere)
-                            tipo = "Basal"
-                            valor = 1.0
-                        
-                        st.success(f"**Gasto Energético Total:** {resultado:.2f} kcal")
-                        st.info(f"**Fator aplicado:** {tipo} (x{valor:.2f})")
-                        
-                        st.session_state.historico.append({
-                            'tipo': calculo_selecionado,
-                            'resultado': resultado,
-                            'data': datetime.now()
-                        })
-
-            elif calculo_selecionado == "Requerimento Energético Crianças/Adolescentes":
-                st.subheader("Cálculo para Crianças e Adolescentes")
-                
-                col1, col2 = st.columns(2)
-                with col1:
-                    idade = st.number_input("Idade (anos)", min_value=0.0, max_value=18.0, value=5.0, step=0.1)
-                    peso = st.number_input("Peso (kg)", min_value=1.0, max_value=150.0, value=20.0, step=0.1)
-                with col2:
-                    estatura = st.number_input("Estatura (metros)", min_value=0.3, max_value=2.5, value=1.1, step=0.01)
-                    sexo = st.selectbox("Sexo", options=[s.value for s in Sexo])
-                    fator_atividade = st.number_input("Fator de Atividade", min_value=1.0, max_value=2.0, value=1.2, step=0.1)
-                
-                if st.button("Calcular Requerimento"):
-                    resultado = calcular_requerimento_energetico(
-                        idade, peso, estatura, Sexo(sexo), fator_atividade
-                    )
-                    
-                    if resultado is None:
-                        st.error("Idade fora da faixa suportada (0-18 anos)")
-                    else:
-                        st.success(f"**Requerimento Energético Estimado:** {resultado:.2f} kcal/dia")
-                        
-                        # Recomendações por faixa etária
-                        st.info("""
-                        **Referências Diárias:**
-                        - 1-3 anos: 1,000-1,400 kcal
-                        - 4-8 anos: 1,200-2,000 kcal
-                        - 9-13 anos: 1,600-2,600 kcal
-                        - 14-18 anos: 1,800-3,200 kcal
-                        """)
-                        
-                        st.session_state.historico.append({
-                            'tipo': calculo_selecionado,
-                            'resultado': resultado,
-                            'data': datetime.now()
-                        })
-
-            elif calculo_selecionado == "Taxa Metabólica Basal (TMB)":
-                st.subheader("Cálculo da Taxa Metabólica Basal")
-                
-                col1, col2 = st.columns(2)
-                with col1:
-                    peso = st.number_input("Peso (kg)", min_value=1.0, max_value=300.0, value=70.0, step=0.1)
-                    idade = st.number_input("Idade (anos)", min_value=0.0, max_value=120.0, value=30.0, step=0.1)
-                with col2:
-                    sexo = st.selectbox("Sexo", options=[s.value for s in Sexo])
-                
-                if st.button("Calcular TMB"):
-                    resultado = calcular_tmb(peso, idade, Sexo(sexo))
-                    
-                    if resultado is None:
-                        st.error("Idade fora da faixa suportada (0-18 anos)")
-                    else:
-                        st.success(f"**Taxa Metabólica Basal:** {resultado:.2f} kcal/dia")
-                        
-                        # Comparação com Harris-Benedict para adultos
-                        if idade > 18:
-                            if Sexo(sexo) == Sexo.MASCULINO:
-                                hb = 88.362 + (13.397 * peso) + (4.799 * 170) - (5.677 * idade)
-                            else:
-                                hb = 447.593 + (9.247 * peso) + (3.098 * 160) - (4.330 * idade)
-                            
-                            st.info(f"**Harris-Benedict estimado:** {hb:.2f} kcal/dia (para adulto)")
-                        
-                        st.session_state.historico.append({
-                            'tipo': calculo_selecionado,
-                            'resultado': resultado,
-                            'data': datetime.now()
-                        })
-
-            elif calculo_selecionado == "Necessidades Nutricionais Paralisia Cerebral":
-                st.subheader("Para Crianças com Paralisia Cerebral")
-                
-                col1, col2 = st.columns(2)
-                with col1:
-                    peso = st.number_input("Peso (kg)", min_value=1.0, max_value=100.0, value=15.0, step=0.1)
-                    altura = st.number_input("Altura (metros)", min_value=0.3, max_value=2.0, value=1.0, step=0.01)
-                with col2:
-                    sexo = st.selectbox("Sexo", options=[s.value for s in Sexo])
-                    idade = st.number_input("Idade (anos)", min_value=0.0, max_value=18.0, value=5.0, step=0.1)
-                    fator_estresse = st.number_input("Fator de Estresse", min_value=1.0, max_value=2.5, value=1.2, step=0.1)
-                
-                if st.button("Calcular Necessidades"):
-                    resultado = calcular_necessidade_pc(
-                        peso, altura, Sexo(sexo), idade, fator_estresse
-                    )
-                    
-                    st.success(f"**Necessidade Energética Estimada:** {resultado:.2f} kcal/dia")
-                    
-                    # Recomendações por nível de atividade
-                    st.info("""
-                    **Referências:**
-                    - PC leve: 13-15 kcal/cm altura
-                    - PC moderada: 10-12 kcal/cm altura
-                    - PC grave: 8-10 kcal/cm altura
-                    """)
-                    
-                    st.session_state.historico.append({
-                        'tipo': calculo_selecionado,
-                        'resultado': resultado,
-                        'data': datetime.now()
-                    })
-
-            elif calculo_selecionado == "Necessidade Energética PC 5-11 anos":
-                st.subheader("Para Crianças com PC (5-11 anos)")
-                
-                altura = st.number_input("Altura (cm)", min_value=50.0, max_value=200.0, value=120.0, step=0.1)
-                nivel = st.selectbox("Nível de Atividade", 
-                                   options=[n.value for n in NivelAtividade])
-                
-                if st.button("Calcular Necessidade"):
-                    resultado = necessidade_energetica_pc_5_11(altura, nivel)
-                    
-                    st.success(f"**Necessidade Energética Estimada:** {resultado:.2f} kcal/dia")
-                    
-                    # Tabela de referência
-                    referencia = pd.DataFrame({
-                        'Nível de Atividade': [n.value for n in NivelAtividade],
-                        'Fórmula': ['13.9 x altura', '10 x altura', '11.1 x altura']
-                    })
-                    st.dataframe(referencia, hide_index=True)
-                    
-                    st.session_state.historico.append({
-                        'tipo': calculo_selecionado,
-                        'resultado': resultado,
-                        'data': datetime.now()
-                    })
-
-            elif calculo_selecionado == "Necessidade Energética PC Estável":
-                st.subheader("Para Crianças/Adolescentes com PC Estáveis")
-                
-                altura = st.number_input("Altura (cm)", min_value=50.0, max_value=200.0, value=120.0, step=0.1)
-                condicao = st.selectbox("Condição Motora", 
-                                      ["sem disfunção motora", 
-                                       "não apresentar disfunção mas deambular", 
-                                       "não deambular (caminhar)"])
-                
-                if st.button("Calcular Necessidade"):
-                    resultado = necessidade_energetica_pc_estaveis(altura, condicao)
-                    
-                    st.success(f"**Necessidade Energética Estimada:** {resultado:.2f} kcal/dia")
-                    
-                    # Gráfico comparativo
-                    condicoes = ["sem disfunção motora", "não apresentar disfunção mas deambular", "não deambular (caminhar)"]
-                    valores = [15*altura, 14*altura, 11*altura]
-                    
-                    fig = px.bar(x=condicoes, y=valores, 
-                                labels={'x': 'Condição Motora', 'y': 'kcal/dia'},
-                                title="Comparação por Condição Motora")
-                    st.plotly_chart(fig, use_container_width=True)
-                    
-                    st.session_state.historico.append({
-                        'tipo': calculo_selecionado,
-                        'resultado': resultado,
-                        'data': datetime.now()
-                    })
-
-            elif calculo_selecionado == "Necessidade Energética PC Geral":
-                st.subheader("Para Crianças com Paralisia Cerebral")
-                
-                col1, col2 = st.columns(2)
-                with col1:
-                    peso = st.number_input("Peso (kg)", min_value=1.0, max_value=100.0, value=15.0, step=0.1)
-                    altura = st.number_input("Altura (cm)", min_value=50.0, max_value=200.0, value=120.0, step=0.1)
-                with col2:
-                    idade = st.number_input("Idade (anos)", min_value=0.0, max_value=18.0, value=5.0, step=0.1)
-                    sexo = st.selectbox("Sexo", options=[s.value for s in Sexo])
-                
-                if st.button("Calcular Necessidade"):
-                    resultado = necessidade_energetica_pc(peso, altura, idade, Sexo(sexo))
-                    
-                    st.success(f"**Necessidade Energética Estimada:** {resultado:.2f} kcal/dia")
-                    
-                    # Fórmula exibida
-                    if Sexo(sexo) == Sexo.MASCULINO:
-                        formula = "66.5 + (13.75 × Peso) + (5.003 × Altura) - (6.775 × Idade)"
-                    else:
-                        formula = "65.1 + (9.56 × Peso) + (1.85 × Altura) - (4.676 × Idade)"
-                    
-                    st.info(f"**Fórmula utilizada:** {formula}")
-                    
-                    st.session_state.historico.append({
-                        'tipo': calculo_selecionado,
-                        'resultado': resultado,
-                        'data': datetime.now()
-                    })
-
-            elif calculo_selecionado == "Necessidade Energética Síndrome de Down":
-                st.subheader("Para Crianças com Síndrome de Down (5-12 anos)")
-                
-                altura = st.number_input("Altura (cm)", min_value=50.0, max_value=200.0, value=120.0, step=0.1)
-                sexo = st.selectbox("Sexo", options=[s.value for s in Sexo])
-                
-                if st.button("Calcular Necessidade"):
-                    resultado = necessidade_sindrome_down(altura, Sexo(sexo))
-                    
-                    st.success(f"**Necessidade Energética Estimada:** {resultado:.2f} kcal/dia")
-                    
-                    # Comparação com crianças típicas
-                    if Sexo(sexo) == Sexo.MASCULINO:
-                        tipico = 16.1 * altura * 1.15  # +15% para crianças típicas
-                    else:
-                        tipico = 14.3 * altura * 1.15
-                    
-                    st.info(f"**Comparação com criança típica:** ~{tipico:.2f} kcal/dia (+15%)")
-                    
-                    st.session_state.historico.append({
-                        'tipo': calculo_selecionado,
-                        'resultado': resultado,
-                        'data': datetime.now()
-                    })
-
-            elif calculo_selecionado == "GEB Criança Criticamente Enferma":
-                st.subheader("Gasto Energético Basal para Crianças Enfermas")
-                
-                col1, col2 = st.columns(2)
-                with col1:
-                    idade_meses = st.number_input("Idade (meses)", min_value=0.0, max_value=240.0, value=12.0, step=0.1)
-                    peso = st.number_input("Peso (kg)", min_value=1.0, max_value=100.0, value=10.0, step=0.1)
-                with col2:
-                    temp_c = st.number_input("Temperatura (°C)", min_value=30.0, max_value=45.0, value=37.0, step=0.1)
-                
-                if st.button("Calcular GEB"):
-                    resultado = geb_critica(idade_meses, peso, temp_c)
-                    
-                    st.success(f"**Gasto Energético Basal Estimado:** {resultado:.2f} kcal/dia")
-                    
-                    # Fórmula exibida
-                    st.info("""
-                    **Fórmula utilizada:**
-                    [(17 × idade em meses) + (48 × peso em kg) + (292 × temperatura em °C) - 9677] × 0.239
-                    """)
-                    
-                    st.session_state.historico.append({
-                        'tipo': calculo_selecionado,
-                        'resultado': resultado,
-                        'data': datetime.now()
-                    })
-
-            elif calculo_selecionado == "TMB Schofield para Crianças Gravemente Doentes":
-                st.subheader("TMB pela Equação de Schofield")
-                
-                col1, col2 = st.columns(2)
-                with col1:
-                    peso = st.number_input("Peso (kg)", min_value=1.0, max_value=150.0, value=15.0, step=0.1)
-                    estatura = st.number_input("Estatura (cm)", min_value=30.0, max_value=200.0, value=100.0, step=0.1)
-                with col2:
-                    idade = st.number_input("Idade (anos)", min_value=0.0, max_value=18.0, value=5.0, step=0.1)
-                    sexo = st.selectbox("Sexo", options=[s.value for s in Sexo])
-                
-                if st.button("Calcular TMB Schofield"):
-                    resultado = tmb_schofield(peso, estatura/100, idade, Sexo(sexo))
-                    
-                    if resultado is None:
-                        st.error("Idade fora da faixa suportada (0-18 anos)")
-                    else:
-                        st.success(f"**Taxa Metabólica Basal (Schofield):** {resultado:.2f} kcal/dia")
-                        
-                        # Comparação com TMB normal
-                        tmb_normal = calcular_tmb(peso, idade, Sexo(sexo))
-                        if tmb_normal:
-                            diferenca = resultado - tmb_normal
-                            percentual = (diferenca / tmb_normal) * 100
-                            st.info(f"**Comparação com TMB padrão:** {tmb_normal:.2f} kcal/dia ({diferenca:+.2f} kcal, {percentual:+.2f}%)")
-                        
-                        st.session_state.historico.append({
-                            'tipo': calculo_selecionado,
-                            'resultado': resultado,
-                            'data': datetime.now()
-                        })
-
+            spec = _SPECS.get(calculo_selecionado)
+            if spec is not None:
+                _run_calc(calculo_selecionado, spec, _pending_history, _now)
         except ValueError as e:
             st.error(f"Erro nos dados de entrada: {str(e)}")
         except Exception as e:
             st.error(f"Ocorreu um erro inesperado: {str(e)}")
     
+    if _pending_history['tipo']:
+        for coluna, valores in _pending_history.items():
+            st.session_state.historico[coluna].extend(valores)
+    
     # Rodapé
     st.markdown("---")
     st.caption("© 2025 Calculadora Nutricional - Desenvolvido para profissionais de saúde")
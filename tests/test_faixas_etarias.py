@@ -0,0 +1,122 @@
+"""As tabelas de coeficientes por faixa etária devem reproduzir as fórmulas originais em if/elif."""
+import itertools
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import teste  # noqa: E402
+from teste import Sexo  # noqa: E402
+
+# Limites das faixas e seus vizinhos: lactentes (0.25/0.5/1/2.92), lacuna 2.92-3,
+# 3 | 9 (adicional 20 -> 25), 3 | 10 | 18 (TMB/Schofield/PC) e acima de 18 (sem resultado)
+IDADES = (0.0, 0.25, 0.26, 0.5, 1.0, 2.92, 2.95, 3.0, 3.01, 8.99, 9.0, 10.0, 10.01, 18.0, 18.01, 25.0)
+PESOS = (3.5, 20.0, 61.3)
+SEXOS = (Sexo.MASCULINO, Sexo.FEMININO)
+
+
+# --- Fórmulas originais (antes das tabelas de coeficientes) ---
+def _ref_tmb(peso, idade, sexo):
+    if sexo == Sexo.MASCULINO:
+        if idade <= 3:
+            return 60.9 * peso - 54
+        elif idade <= 10:
+            return 22.7 * peso + 495
+        elif idade <= 18:
+            return 17.5 * peso + 651
+    else:
+        if idade <= 3:
+            return 61 * peso - 51
+        elif idade <= 10:
+            return 22.5 * peso + 499
+        elif idade <= 18:
+            return 12.2 * peso + 746
+    return None
+
+
+def _ref_tmb_schofield(peso, idade, sexo):
+    if sexo == Sexo.MASCULINO:
+        if idade <= 3:
+            return 54.48 * peso - 30.33
+        elif idade <= 10:
+            return 22.7 * peso + 505
+        elif idade <= 18:
+            return 13.4 * peso + 693
+    else:
+        if idade <= 3:
+            return 58.29 * peso - 31.05
+        elif idade <= 10:
+            return 20.3 * peso + 486
+        elif idade <= 18:
+            return 17.7 * peso + 659
+    return None
+
+
+def _ref_requerimento(idade, peso, estatura, sexo, fa):
+    if idade <= 0.25:
+        return 89 * peso - 100 + 175
+    elif idade <= 0.5:
+        return 89 * peso - 100 + 56
+    elif idade <= 1:
+        return 89 * peso - 100 + 22
+    elif idade <= 2.92:
+        return 89 * peso - 100 + 20
+    elif 3 <= idade < 9:
+        if sexo == Sexo.MASCULINO:
+            return 88.5 - 61.9 * idade + fa * (26.7 * peso + 903 * estatura) + 20
+        else:
+            return 135.3 - 30.8 * idade + fa * (10 * peso + 934 * estatura) + 20
+    elif 9 <= idade <= 18:
+        if sexo == Sexo.MASCULINO:
+            return 88.5 - 61.9 * idade + fa * (26.7 * peso + 903 * estatura) + 25
+        else:
+            return 135.3 - 30.8 * idade + fa * (10 * peso + 934 * estatura) + 25
+    return None
+
+
+def _ref_necessidade_pc(peso, altura, sexo, idade, fator_estresse):
+    if idade > 18:
+        return None     # a versão original falhava com UnboundLocalError aqui
+    if sexo == Sexo.FEMININO:
+        if idade <= 3:
+            base = 16.25 * peso + 1023.2 * altura - 413.5
+        elif idade <= 10:
+            base = 16.97 * peso + 161.8 * altura + 371.2
+        else:
+            base = 8.365 * peso + 465 * altura + 200
+    else:
+        if idade <= 3:
+            base = 0.167 * peso + 1517.4 * altura - 617.6
+        elif idade <= 10:
+            base = 19.6 * peso + 130.3 * altura + 414.9
+        else:
+            base = 16.25 * peso + 137.2 * altura + 515.5
+    return base * fator_estresse
+
+
+def _confere(obtido, esperado):
+    if esperado is None:
+        assert obtido is None
+    else:
+        assert obtido == pytest.approx(esperado, rel=1e-12, abs=1e-9)
+
+
+@pytest.mark.parametrize("idade, peso, sexo", list(itertools.product(IDADES, PESOS, SEXOS)))
+def test_tmb_e_schofield(idade, peso, sexo):
+    _confere(teste.calcular_tmb(peso, idade, sexo), _ref_tmb(peso, idade, sexo))
+    # tmb_schofield recebe a estatura em metros, mas ela não entra na fórmula
+    _confere(teste.tmb_schofield(peso, 1.2, idade, sexo), _ref_tmb_schofield(peso, idade, sexo))
+
+
+@pytest.mark.parametrize("idade, peso, sexo", list(itertools.product(IDADES, PESOS, SEXOS)))
+def test_requerimento_energetico(idade, peso, sexo):
+    _confere(teste.calcular_requerimento_energetico(idade, peso, 1.15, sexo, 1.3),
+             _ref_requerimento(idade, peso, 1.15, sexo, 1.3))
+
+
+@pytest.mark.parametrize("idade, peso, sexo", list(itertools.product(IDADES, PESOS, SEXOS)))
+def test_necessidade_pc(idade, peso, sexo):
+    _confere(teste.calcular_necessidade_pc(peso, 1.1, sexo, idade, 1.2),
+             _ref_necessidade_pc(peso, 1.1, sexo, idade, 1.2))
@@ -0,0 +1,33 @@
+"""Regressões do gasto energético total (GET)."""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import teste  # noqa: E402
+
+ERE = 1500.0
+
+
+@pytest.mark.parametrize("fa, fe, esperado", [
+    (None, None, ERE),
+    (1.3, None, ERE * 1.3),
+    (None, 1.2, ERE * 1.2),
+    (0.0, None, 0.0),      # fator zero informado não pode cair no padrão 1.0
+    (None, 0.0, 0.0),
+])
+def test_aplica_o_fator_informado(fa, fe, esperado):
+    assert teste.calcular_gasto_energetico_total(ERE, fa, fe) == pytest.approx(esperado)
+
+
+@pytest.mark.parametrize("fa, fe", [(0.0, 1.3), (1.3, 0.0), (1.3, 1.2)])
+def test_rejeita_os_dois_fatores(fa, fe):
+    with pytest.raises(ValueError):
+        teste.calcular_gasto_energetico_total(ERE, fa, fe)
+
+
+def test_rejeita_ere_nao_positivo():
+    with pytest.raises(ValueError):
+        teste.calcular_gasto_energetico_total(0.0, 1.3)
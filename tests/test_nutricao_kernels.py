@@ -0,0 +1,85 @@
+"""Os pontos de entrada em lote devem se comportar igual com e sem o Numba."""
+import importlib.util
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+RAIZ = Path(__file__).resolve().parent.parent
+IDADES = np.array([0.5, 3.0, 7.0, 10.0, 15.0, 18.0, 25.0])
+PESOS = np.array([8.0, 14.0, 25.0, 32.0, 55.0, 60.0, 70.0])
+ESTATURAS = np.array([0.7, 0.95, 1.2, 1.4, 1.65, 1.7, 1.75])
+
+
+@pytest.fixture(params=["numba", "python"])
+def kernels(request, monkeypatch):
+    """Carrega nutricao_kernels com o Numba real ou com a importação bloqueada"""
+    if request.param == "numba":
+        # Importação normal: o cache do Numba (cache=True) fica associado ao módulo real
+        pytest.importorskip("numba")
+        monkeypatch.syspath_prepend(str(RAIZ))
+        return importlib.import_module("nutricao_kernels")
+    monkeypatch.setitem(sys.modules, "numba", None)
+    spec = importlib.util.spec_from_file_location("nutricao_kernels_python", RAIZ / "nutricao_kernels.py")
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+def _esperado(kernel, *colunas):
+    return np.array([kernel(*args) for args in zip(*colunas)])
+
+
+def test_aceita_escalares_e_sexo_inteiro(kernels):
+    assert float(kernels.tmb_lote(70.0, 5.0, 1)) == pytest.approx(kernels._tmb(70.0, 5.0, 1))
+    assert float(kernels.tmb_schofield_lote(70.0, 5.0, 0)) == pytest.approx(
+        kernels._tmb_schofield(70.0, 5.0, 0))
+
+
+@pytest.mark.parametrize("sexo", [0, 1])
+def test_lotes_batem_com_kernels_escalares(kernels, sexo):
+    sexos = np.full(IDADES.size, sexo)     # int64, como vem de np.array([0, 1])
+    fa = np.full(IDADES.size, 1.2)
+    casos = [
+        (kernels.tmb_lote, kernels._tmb, (PESOS, IDADES, sexos)),
+        (kernels.tmb_schofield_lote, kernels._tmb_schofield, (PESOS, IDADES, sexos)),
+        (kernels.req_energetico_lote, kernels._req_energetico, (IDADES, PESOS, ESTATURAS, sexos, fa)),
+        (kernels.necessidade_pc_geral_lote, kernels._necessidade_pc_geral,
+         (PESOS, ESTATURAS * 100, IDADES, sexos)),
+        (kernels.geb_critica_lote, kernels._geb_critica, (IDADES * 12, PESOS, np.full(IDADES.size, 37.5))),
+    ]
+    for lote, kernel, colunas in casos:
+        np.testing.assert_allclose(lote(*colunas), _esperado(kernel, *colunas), rtol=1e-12)
+
+
+def test_idade_fora_da_faixa_vira_nan(kernels):
+    resultado = kernels.tmb_lote(np.array([70.0, 70.0]), np.array([5.0, 40.0]), np.array([0, 1]))
+    assert not np.isnan(resultado[0])
+    assert np.isnan(resultado[1])
+
+
+@pytest.mark.parametrize("sexo", [2, -1, [0, 2], [1, -1]])
+def test_rejeita_codigo_de_sexo_invalido(kernels, sexo):
+    n = np.size(sexo)
+    pesos, idades = np.full(n, 70.0), np.full(n, 5.0)
+    for chamada in (
+        lambda: kernels.tmb_lote(pesos, idades, sexo),
+        lambda: kernels.tmb_schofield_lote(pesos, idades, sexo),
+        lambda: kernels.req_energetico_lote(idades, pesos, np.full(n, 1.1), sexo, np.full(n, 1.2)),
+        lambda: kernels.necessidade_pc_geral_lote(pesos, np.full(n, 110.0), idades, sexo),
+    ):
+        with pytest.raises(ValueError):
+            chamada()
+
+
+@pytest.mark.parametrize("peso, idade", [(0.0, 5.0), (-3.0, 5.0), (70.0, -1.0)])
+def test_rejeita_peso_ou_idade_invalidos(kernels, peso, idade):
+    with pytest.raises(ValueError):
+        kernels.tmb_lote([70.0, peso], [5.0, idade], [0, 1])
+    with pytest.raises(ValueError):
+        kernels.tmb_schofield_lote([70.0, peso], [5.0, idade], [0, 1])
+    with pytest.raises(ValueError):
+        kernels.req_energetico_lote([5.0, idade], [70.0, peso], [1.1, 1.1], [0, 1], [1.2, 1.2])
+    with pytest.raises(ValueError):
+        kernels.necessidade_pc_geral_lote([70.0, peso], [110.0, 110.0], [5.0, idade], [0, 1])
@@ -0,0 +1,77 @@
+"""As versões *_vec devem reproduzir as funções escalares, elemento a elemento."""
+import itertools
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import teste  # noqa: E402
+from teste import Condicao, Raca, Sexo  # noqa: E402
+
+SEXOS = (Sexo.MASCULINO, Sexo.FEMININO)
+RACAS = (Raca.BRANCA, Raca.NEGRA)
+
+
+def _comparar(vec, escalar, *colunas):
+    esperado = np.array([escalar(*args) for args in zip(*colunas)], dtype=np.float64)
+    np.testing.assert_allclose(vec, esperado, rtol=1e-9, atol=1e-9)
+
+
+def test_peso_ajustado():
+    casos = list(itertools.product([45.0, 70.0, 120.5], [50.0, 65.0], (Condicao.OBESIDADE, Condicao.DESNUTRICAO)))
+    atual, ideal, cond = map(np.array, zip(*casos))
+    _comparar(teste.calcular_peso_ajustado_vec(atual, ideal, cond == Condicao.OBESIDADE),
+              teste.calcular_peso_ajustado, atual, ideal, [Condicao(c) for c in cond])
+
+
+def test_perda_peso():
+    usual, atual = np.array([70.0, 80.0, 55.5]), np.array([65.0, 82.0, 40.1])
+    _comparar(teste.calcular_perda_peso_vec(usual, atual), teste.calcular_perda_peso, usual, atual)
+
+
+def test_peso_crianca():
+    casos = list(itertools.product([35.0, 48.2], [18.0, 25.5], SEXOS, RACAS))
+    joelho, braco, sexo, raca = (np.array(c) for c in zip(*casos))
+    _comparar(teste.estimar_peso_crianca_vec(joelho, braco, sexo == Sexo.MASCULINO, raca == Raca.BRANCA),
+              teste.estimar_peso_crianca, joelho, braco, [Sexo(s) for s in sexo], [Raca(r) for r in raca])
+
+
+def test_percentual_gordura():
+    casos = list(itertools.product([10.0, 25.5, 35.0, 50.0], SEXOS, [1, 2, 3, 4, 5], RACAS))
+    dobras, sexo, tanner, raca = (np.array(c) for c in zip(*casos))
+    _comparar(teste.calcular_percentual_gordura_vec(dobras, sexo == Sexo.MASCULINO, tanner, raca == Raca.BRANCA),
+              teste.calcular_percentual_gordura, dobras, [Sexo(s) for s in sexo], tanner.tolist(),
+              [Raca(r) for r in raca])
+
+
+@pytest.mark.parametrize("tanner", [0, 6, 2.5])
+def test_percentual_gordura_rejeita_tanner_invalido(tanner):
+    with pytest.raises(ValueError):
+        teste.calcular_percentual_gordura(20.0, Sexo.MASCULINO, tanner, Raca.BRANCA)
+    with pytest.raises(ValueError):
+        teste.calcular_percentual_gordura_vec(np.array([20.0, 20.0]), np.array([True, True]),
+                                              np.array([3, tanner]), np.array([True, True]))
+
+
+def test_medidas_do_braco():
+    braco, dobra, amb = np.array([20.0, 25.5, 31.0]), np.array([8.0, 12.5, 20.0]), np.array([20.0, 35.0, 48.0])
+    _comparar(teste.calcular_circ_muscular_braco_vec(braco, dobra), teste.calcular_circ_muscular_braco, braco, dobra)
+    _comparar(teste.calcular_area_gorda_braco_vec(braco, amb), teste.calcular_area_gorda_braco, braco, amb)
+    _comparar(teste.calcular_area_muscular_braco_vec(braco, dobra), teste.calcular_area_muscular_braco, braco, dobra)
+
+
+def test_estatura_paralisia_cerebral():
+    cs, ct, cj = np.array([15.0, 22.3]), np.array([18.0, 30.1]), np.array([12.0, 25.4])
+    lote = teste.estimar_estatura_paralisia_cerebral_vec(cs, ct, cj)
+    for chave, valores in lote.items():
+        _comparar(valores, lambda *a: teste.estimar_estatura_paralisia_cerebral(*a)[chave], cs, ct, cj)
+
+
+@pytest.mark.parametrize("vec", [teste.calcular_perda_peso_vec, teste.calcular_circ_muscular_braco_vec,
+                                 teste.calcular_area_gorda_braco_vec, teste.calcular_area_muscular_braco_vec])
+def test_rejeitam_medidas_nao_positivas(vec):
+    with pytest.raises(ValueError):
+        vec(np.array([0.0, 20.0]), np.array([10.0, 10.0]))